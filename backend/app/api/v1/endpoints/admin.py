@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.schemas.cache import (
+    CacheEntryInput,
+    CacheEntryOut,
+    CacheRegionInput,
+    CacheStatsOut,
+    InvalidateOut,
+    QuotaOut,
+    ResizeInput,
+    WarmInput,
+    WarmOut,
+)
+from app.services.quota_service import upstream_budget
+from app.services.weather_cache_service import (
+    get_cache_stats,
+    invalidate_entry,
+    invalidate_region,
+    list_cache_entries,
+    resize_cache,
+    warm_cache,
+)
+
+router = APIRouter()
+
+@router.get(
+    "/cache/weather",
+    response_model=CacheStatsOut,
+    description="Size and hit/miss/eviction statistics of the weather cache.",
+)
+def weather_cache_stats():
+    return get_cache_stats()
+
+@router.get(
+    "/cache/weather/entries",
+    response_model=list[CacheEntryOut],
+    description="Cached locations with their age and size.",
+)
+def weather_cache_entries():
+    return list_cache_entries()
+
+@router.delete(
+    "/cache/weather/entries",
+    response_model=InvalidateOut,
+    description="Invalidate the cached weather of one location.",
+)
+def invalidate_weather_entry(data: CacheEntryInput = Depends()):
+    return InvalidateOut(invalidated=invalidate_entry(data.lat, data.lon))
+
+@router.post(
+    "/cache/weather/invalidate",
+    response_model=InvalidateOut,
+    description="Invalidate the cached weather of every location in a bounding box.",
+)
+def invalidate_weather_region(data: CacheRegionInput):
+    return InvalidateOut(invalidated=invalidate_region(**dict(data)))
+
+@router.post(
+    "/cache/weather/warm",
+    response_model=WarmOut,
+    description="Preload the weather of a list of locations and/or of all stored fields.",
+)
+def warm_weather_cache(data: WarmInput, db: Session = Depends(get_db)):
+    return warm_cache(db=db, coordinates=data.coordinates, fields=data.fields)
+
+@router.put(
+    "/cache/weather/size",
+    response_model=CacheStatsOut,
+    description="Change the capacity of the weather cache.",
+)
+def resize_weather_cache(data: ResizeInput):
+    return resize_cache(data.maxsize)
+
+@router.get(
+    "/quota",
+    response_model=QuotaOut,
+    description=(
+        "Remaining weather API budget of each quota window, and the calls "
+        "used, deferred and rejected by priority."
+    ),
+)
+def upstream_quota():
+    return upstream_budget.metrics()
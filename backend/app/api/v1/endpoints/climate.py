@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from app.services.climate_service import get_climate
 from app.schemas.climate import ClimateInput, ClimateOut
 
@@ -10,6 +10,8 @@ def get_climate_info(
 ):
     """Fetch the climate data."""
     climate_data = get_climate(**dict(data))
+    if not climate_data:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
 
     climate_data["climate"] = climate_data["climate"].value
     return climate_data
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.dependencies.auth import get_current_user
 from app.models.user import User
 from app.models.crop import Crop
@@ -13,8 +13,14 @@ from app.services.crop_service import (
     reset_user_crops,
     update_user_crop,
     delete_user_crop,
+    set_user_crop_stages,
+    delete_user_crop_stages,
 )
-from app.schemas.crop import CropCreate, CropUpdate
+from app.schemas.crop import CropCreate, CropUpdate, CropStagesIn, CropStagesOut, KcOut
+from app.services.kc_service import crop_Kc_window
+from datetime import date
+from typing import Optional
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -33,14 +39,14 @@ def list_crops(
         reset_user_crops(db=db, user_id=current_user.id)
         crops = db.query(Crop).filter(Crop.user_id == user_id).all()
 
-    return {
+    return FastJSONResponse({
         crop.name: {
             "Kc": crop.Kc,
             "CEemax": crop.CEemax,
             "H": crop.H,
             "f": crop.f,
         } for crop in crops
-    }
+    })
 
 @router.get(
     "/{crop_name}",
@@ -129,6 +135,74 @@ def delete_crop(
     delete_user_crop(db=db, crop=crop)
 
 
+@router.get(
+    "/{crop_name}/stages",
+    response_model=CropStagesOut,
+    description="Get the growth-stage Kc curve of a crop.",
+)
+def get_crop_stages(
+    crop_name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    crop = get_user_crop_by_name(crop_name=crop_name, db=db, user_id=current_user.id)
+    if not crop or not crop.stages:
+        raise HTTPException(status_code=404, detail="Crop stages not found")
+    return crop.stages
+
+@router.put(
+    "/{crop_name}/stages",
+    response_model=CropStagesOut,
+    description=(
+        "Set the FAO-56 growth-stage Kc curve and planting date of a crop. "
+        "Its Kc then follows the curve instead of the constant Kc."
+    ),
+)
+def set_crop_stages(
+    crop_name: str,
+    stages: CropStagesIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    crop = get_user_crop_by_name(crop_name=crop_name, db=db, user_id=current_user.id)
+    if not crop:
+        raise HTTPException(status_code=404, detail="Crop not found")
+    return set_user_crop_stages(db=db, crop=crop, stages=stages)
+
+@router.delete(
+    "/{crop_name}/stages",
+    description="Remove the growth-stage curve of a crop, back to its constant Kc.",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def delete_crop_stages(
+    crop_name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    crop = get_user_crop_by_name(crop_name=crop_name, db=db, user_id=current_user.id)
+    if not crop or not crop.stages:
+        raise HTTPException(status_code=404, detail="Crop stages not found")
+    delete_user_crop_stages(db=db, crop=crop)
+
+@router.get(
+    "/{crop_name}/kc",
+    response_model=KcOut,
+    description="Daily Kc of a crop from `start`, today by default.",
+)
+def get_crop_kc(
+    crop_name: str,
+    start: Optional[date] = None,
+    days: int = Query(7, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    crop = get_user_crop_by_name(crop_name=crop_name, db=db, user_id=current_user.id)
+    if not crop:
+        raise HTTPException(status_code=404, detail="Crop not found")
+    start = start or date.today()
+    return KcOut(start=start, Kc=crop_Kc_window(crop, start, days).astype(float).round(4).tolist())
+
+
 @router.post(
     "/reset",
     description="Reset crops to default for the current user.",
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.dashboard import CropMetrics, DashboardInput, DashboardOut
+from app.services.climate_service import get_climate
+from app.services.crop_service import get_user_crops, reset_user_crops
+from app.services.irrigation_service import calculate_crop_metrics
+
+router = APIRouter()
+
+@router.get(
+    "/",
+    response_model=DashboardOut,
+    description=(
+        "Returns the climate and, for every crop of the current user, all the "
+        "irrigation metrics, computed from a single crop query and weather lookup."
+    ),
+)
+def get_dashboard(
+    data: DashboardInput = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    climate_data = get_climate(data.lat, data.lon)
+    if not climate_data or climate_data["ET0"] is None:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
+
+    crops = get_user_crops(db=db, user_id=current_user.id)
+    if not crops:
+        reset_user_crops(db=db, user_id=current_user.id)
+        crops = get_user_crops(db=db, user_id=current_user.id)
+
+    metrics = []
+    for crop in crops:
+        values = calculate_crop_metrics(
+            crop=crop,
+            climate_data=climate_data,
+            CEa=data.CEa,
+            EL=data.EL,
+            texture=data.texture,
+            CU=data.CU,
+        )
+        metrics.append(CropMetrics(
+            name=crop.name,
+            Kc=crop.Kc,
+            CEemax=crop.CEemax,
+            H=crop.H,
+            f=crop.f,
+            **{
+                key: round(values[key], 2)
+                for key in ("NRn", "Pe", "ETc", "Ea", "NRt", "Dn", "Dt", "I")
+            },
+        ))
+
+    return DashboardOut(
+        climate={**climate_data, "climate": climate_data["climate"].value},
+        crops=metrics,
+    )
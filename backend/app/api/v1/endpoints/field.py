@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.field import FieldCreate, FieldOut, FieldUpdate, HourlyOut
+from app.services.bundle_service import BundleFormat, bundle_public_key, get_field_bundle
+from app.services.hourly_service import get_field_hourly
+from app.services.push_service import recommendation_hub
+from app.utils.responses import FastJSONResponse
+from app.services.field_service import (
+    create_user_field,
+    delete_user_field,
+    get_user_field,
+    get_user_fields,
+    update_user_field,
+)
+
+router = APIRouter()
+
+@router.get(
+    "/",
+    response_model=list[FieldOut],
+    description="Returns the fields of the current user.",
+)
+def list_fields(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_user_fields(db=db, user_id=current_user.id)
+
+@router.post("/", response_model=FieldOut)
+def create(
+    field: FieldCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return create_user_field(db=db, field=field, user_id=current_user.id)
+
+@router.get(
+    "/stream",
+    description=(
+        "Server-sent events of the NRt, Dt and I of the given fields, or of "
+        "every field of the current user. The current values are sent on "
+        "connection, then again only when the weather, the crop or the field "
+        "changes them."
+    ),
+)
+async def stream_recommendations(
+    field_id: Optional[list[int]] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    subscriber = await recommendation_hub.subscribe(user_id=current_user.id, field_ids=field_id)
+    return StreamingResponse(
+        recommendation_hub.events(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get(
+    "/bundle-key",
+    description="Hex of the raw Ed25519 public key that verifies schedule bundles.",
+)
+def get_bundle_key(current_user: User = Depends(get_current_user)):
+    return {"algorithm": "Ed25519", "public_key": bundle_public_key()}
+
+@router.get("/{field_id}", response_model=FieldOut)
+def get_field(
+    field_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+    return field
+
+@router.put("/{field_id}", response_model=FieldOut)
+def update_field(
+    field_id: int,
+    field_update: FieldUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+    return update_user_field(db=db, field=field, field_update=field_update)
+
+@router.delete("/{field_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_field(
+    field_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+    delete_user_field(db=db, field=field)
+
+@router.get(
+    "/{field_id}/bundle",
+    description=(
+        "Signed schedule bundle of a field for controllers running offline: "
+        "the daily NRn, NRt and I of the next `days` days. Supports "
+        "conditional requests with If-None-Match. The binary format is a "
+        "little-endian header (magic, version, field id, start day ordinal, "
+        "days, Dn, Dt, Ea), the float32 NRn, NRt and I series, and the "
+        "Ed25519 signature of the preceding bytes, see /fields/bundle-key."
+    ),
+)
+def get_bundle(
+    field_id: int,
+    days: int = 7,
+    format: BundleFormat = BundleFormat.JSON,
+    if_none_match: str = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+
+    etag, content = get_field_bundle(
+        db=db, field=field, days=days, format=format, if_none_match=if_none_match,
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if content is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = "application/json" if format == BundleFormat.JSON else "application/octet-stream"
+    return Response(content=content, media_type=media_type, headers=headers)
+
+@router.get(
+    "/{field_id}/hourly",
+    response_model=HourlyOut,
+    description=(
+        "Hourly NRn, NRt and soil water deficit of a field from the current "
+        "hour, for pulse drip irrigation. The deficit starts from `deficit` "
+        "[mm]; `due` is the first hour it reaches the net dose Dn."
+    ),
+)
+def get_hourly(
+    field_id: int,
+    hours: int = 48,
+    deficit: float = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+    return FastJSONResponse(get_field_hourly(db=db, field=field, hours=hours, deficit=deficit))
@@ -1,4 +1,6 @@
+import numpy as np
 from app.db.session import get_db
+from app.models.crop import Crop
 from sqlalchemy.orm import Session
 from app.schemas.irrigation import (
     NRnInput,
@@ -13,6 +15,11 @@ from app.schemas.irrigation import (
     DtOut,
     IInput,
     IOut,
+    GridFormat,
+    GridInput,
+    GridOut,
+    SweepInput,
+    SweepOut,
 )
 from app.services.irrigation_service import (
     calculate_NRn,
@@ -20,7 +27,14 @@ from app.services.irrigation_service import (
     calculate_Dn,
     calculate_I,
 )
-from fastapi import APIRouter, Depends
+from app.schemas.allocation import AllocationInput, AllocationOut
+from app.services.allocation_service import allocate_water, calculate_demand
+from app.schemas.schedule import ScheduleInput, ScheduleOut
+from app.services.schedule_service import build_schedule, calculate_duration, format_time, is_due
+from app.services.grid_service import GRID_BANDS, get_requirement_grid, serialize_grid
+from app.services.sweep_service import run_sweep
+from app.utils.responses import FastJSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 router = APIRouter()
 
@@ -138,3 +152,149 @@ def get_I(
     return IOut(
             I=calculate_I(NRn, Dn),
     )
+
+
+@router.post(
+    "/sweep",
+    response_model=SweepOut,
+    description="Evaluate NRt over every combination of the given field settings.",
+)
+def get_sweep(
+    data: SweepInput,
+    db: Session = Depends(get_db)
+):
+    return FastJSONResponse(run_sweep(db=db, data=data))
+
+@router.post(
+    "/allocate",
+    response_model=AllocationOut,
+    description="Split a water budget between fields to minimize the yield loss.",
+)
+def get_allocation(data: AllocationInput):
+    area = np.array([field.area for field in data.fields], dtype=np.float64)
+    demand = calculate_demand(
+        NRt=np.array([field.NRt for field in data.fields], dtype=np.float64),
+        area=area,
+    )
+    allocated, fraction, loss = allocate_water(
+        demand=demand,
+        area=area,
+        priority=np.array([field.priority for field in data.fields], dtype=np.float64),
+        Ky=np.array([field.Ky for field in data.fields], dtype=np.float64),
+        budget=data.budget,
+    )
+
+    return FastJSONResponse({
+        "budget": data.budget,
+        "demand": round(float(demand.sum()), 2),
+        "allocated": round(float(allocated.sum()), 2),
+        "yield_loss": round(float(loss.sum()), 4),
+        "fields": [
+            {
+                "id": field.id,
+                "demand": d,
+                "allocated": a,
+                "fraction": f,
+                "yield_loss": l,
+            }
+            for field, d, a, f, l in zip(
+                data.fields,
+                np.round(demand, 2).tolist(),
+                np.round(allocated, 2).tolist(),
+                np.round(fraction, 4).tolist(),
+                np.round(loss, 4).tolist(),
+            )
+        ],
+    })
+
+@router.post(
+    "/schedule",
+    response_model=ScheduleOut,
+    description="Build today's valve schedule of the zones sharing a pump, keeping its peak load low.",
+)
+def get_schedule(data: ScheduleInput):
+    due = []
+    skipped = []
+    for zone in data.zones:
+        (due if is_due(zone.I, zone.days_since_last) else skipped).append(zone)
+
+    flow = np.array([zone.flow for zone in due], dtype=np.float64)
+    duration = calculate_duration(
+        Dt=np.array([zone.Dt for zone in due], dtype=np.float64),
+        area=np.array([zone.area for zone in due], dtype=np.float64),
+        flow=flow,
+    )
+    start, load = build_schedule(
+        duration=duration,
+        flow=flow,
+        pump_capacity=data.pump_capacity,
+        window_hours=data.window_hours,
+        slot_minutes=data.slot_minutes,
+    )
+
+    runs = []
+    unscheduled = []
+    for zone, slot, hours in zip(due, start.tolist(), duration.tolist()):
+        if slot < 0:
+            unscheduled.append(zone.id)
+            continue
+        runs.append((slot, {
+            "id": zone.id,
+            "start": format_time(data.window_start, slot, data.slot_minutes),
+            "end": format_time(data.window_start + hours, slot, data.slot_minutes),
+            "duration": round(hours, 2),
+            "volume": round(hours * zone.flow, 2),
+        }))
+
+    return FastJSONResponse({
+        "runs": [run for _, run in sorted(runs, key=lambda item: item[0])],
+        "unscheduled": unscheduled,
+        "skipped": [zone.id for zone in skipped],
+        "peak_flow": round(float(load.max(initial=0)), 2),
+        "slot_minutes": data.slot_minutes,
+        "load": np.round(load, 2),
+    })
+
+@router.get(
+    "/grid",
+    response_model=GridOut,
+    description=(
+        "Irrigation requirement raster of a crop over a bounding box. "
+        "The binary format is the little-endian float32 array of shape "
+        "(bands, rows, cols) described by the X-Grid-* headers."
+    ),
+)
+def get_grid(
+    data: GridInput = Depends(),
+    db: Session = Depends(get_db)
+):
+    crop = db.query(Crop).filter(Crop.name == data.crop_name).first()
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{data.crop_name}' not found.")
+
+    grid, origin_lat, origin_lon = get_requirement_grid(
+        crop=crop,
+        min_lat=data.min_lat,
+        min_lon=data.min_lon,
+        max_lat=data.max_lat,
+        max_lon=data.max_lon,
+        resolution=data.resolution,
+        CEa=data.CEa,
+        EL=data.EL,
+        texture=data.texture,
+        CU=data.CU,
+    )
+
+    if data.format == GridFormat.BINARY:
+        return Response(
+            content=grid.astype("<f4").tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Grid-Bands": ",".join(GRID_BANDS),
+                "X-Grid-Shape": ",".join(map(str, grid.shape)),
+                "X-Grid-Origin": f"{origin_lat},{origin_lon}",
+                "X-Grid-Resolution": str(data.resolution),
+            },
+        )
+
+    return FastJSONResponse(serialize_grid(grid, origin_lat, origin_lon, data.resolution))
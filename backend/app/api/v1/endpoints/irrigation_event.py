@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.irrigation_event import (
+    EventCreate,
+    EventListInput,
+    EventOut,
+    EventPage,
+    SummaryInput,
+    SummaryRow,
+)
+from app.services.field_service import calculate_field_NRt, get_user_field
+from app.services.irrigation_event_service import create_event, list_events, summarize_events
+from app.utils.permissions import ensure_admin_or_self
+
+router = APIRouter()
+
+@router.post(
+    "/",
+    response_model=EventOut,
+    description="Record the irrigation applied to a field.",
+)
+def create(
+    event: EventCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    field = get_user_field(db=db, field_id=event.field_id, user_id=current_user.id)
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+
+    recommended = event.recommended
+    if recommended is None:
+        recommended = round(calculate_field_NRt(db=db, field=field), 2)
+
+    return create_event(
+        db=db,
+        field=field,
+        applied=event.applied,
+        recommended=recommended,
+        applied_at=event.applied_at,
+    )
+
+@router.get(
+    "/",
+    response_model=EventPage,
+    description="Returns the irrigation events of the current user, newest first.",
+)
+def list_user_events(
+    data: EventListInput = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    events, next_cursor = list_events(db=db, user_id=current_user.id, **dict(data))
+    return EventPage(items=events, next_cursor=next_cursor)
+
+@router.get(
+    "/summary",
+    response_model=list[SummaryRow],
+    description="Water applied vs recommended, grouped by field, crop or week.",
+)
+def get_summary(
+    data: SummaryInput = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    user_id = current_user.id if data.user_id is None else data.user_id
+    ensure_admin_or_self(current_user, user_id)
+
+    return [
+        SummaryRow(
+            key=str(key),
+            events=events,
+            applied=round(applied, 2),
+            recommended=round(recommended, 2),
+            ratio=round(applied / recommended, 3) if recommended else None,
+        )
+        for key, events, applied, recommended in summarize_events(
+            db=db,
+            user_id=user_id,
+            group_by=data.group_by,
+            start=data.start,
+            end=data.end,
+        )
+    ]
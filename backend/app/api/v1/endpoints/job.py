@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.irrigation import GridInput, SweepInput
+from app.schemas.job import JobOut
+from app.services.job_service import (
+    JobKind,
+    JobStatus,
+    cancel_job,
+    create_job,
+    get_user_job,
+    get_user_jobs,
+)
+
+router = APIRouter()
+
+@router.post(
+    "/grid",
+    response_model=JobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    description=(
+        "Computes an irrigation requirement raster in the background. "
+        "Larger bounding boxes than `/irrigation/grid` are accepted; the "
+        "result is the JSON raster."
+    ),
+)
+def submit_grid(
+    data: GridInput,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return create_job(db=db, user_id=current_user.id, kind=JobKind.GRID, params=data.model_dump(mode="json"))
+
+@router.post(
+    "/sweep",
+    response_model=JobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    description="Evaluates an NRt sweep in the background.",
+)
+def submit_sweep(
+    data: SweepInput,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return create_job(db=db, user_id=current_user.id, kind=JobKind.SWEEP, params=data.model_dump(mode="json"))
+
+@router.get(
+    "/",
+    response_model=list[JobOut],
+    description="Returns the latest jobs of the current user.",
+)
+def list_jobs(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_user_jobs(db=db, user_id=current_user.id)
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_user_job(db=db, user_id=current_user.id, job_id=job_id)
+
+@router.get(
+    "/{job_id}/result",
+    description="Returns the result of a succeeded job.",
+)
+def get_job_result(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = get_user_job(db=db, user_id=current_user.id, job_id=job_id)
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return Response(content=job.result, media_type="application/json")
+
+@router.delete("/{job_id}", response_model=JobOut)
+def cancel(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = get_user_job(db=db, user_id=current_user.id, job_id=job_id)
+    return cancel_job(db=db, job=job)
@@ -0,0 +1,234 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.organization import DemandRollup, Farm
+from app.models.user import User
+from app.schemas.organization import (
+    DemandRollupOut,
+    FarmCreate,
+    FarmDemandOut,
+    FarmOut,
+    FieldDemandOut,
+    MemberIn,
+    MemberOut,
+    OrganizationCreate,
+    OrganizationDemandOut,
+    OrganizationOut,
+)
+from app.services.demand_service import RollupLevel, get_rollup
+from app.services.organization_service import (
+    MemberRole,
+    accept_invitation,
+    add_farm_field,
+    create_farm,
+    create_organization,
+    decline_invitation,
+    delete_farm,
+    get_farm_field_demands,
+    get_membership,
+    get_organization_farm,
+    get_organization_farms,
+    get_organization_members,
+    get_user_invitations,
+    get_user_organizations,
+    remove_farm_field,
+    remove_organization_member,
+    set_organization_member,
+)
+
+router = APIRouter()
+
+@router.post("/", response_model=OrganizationOut, description="Creates an organization managed by the current user.")
+def create(
+    organization: OrganizationCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return create_organization(db=db, name=organization.name, user_id=current_user.id)
+
+@router.get("/", response_model=list[OrganizationOut], description="Returns the organizations of the current user.")
+def list_organizations(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_user_organizations(db=db, user_id=current_user.id)
+
+@router.get(
+    "/invitations",
+    response_model=list[OrganizationOut],
+    description="Returns the organizations the current user is invited to.",
+)
+def list_invitations(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_user_invitations(db=db, user_id=current_user.id)
+
+@router.post(
+    "/{organization_id}/invitation",
+    response_model=MemberOut,
+    description="Accepts an invitation to the organization.",
+)
+def accept(
+    organization_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return accept_invitation(db=db, organization_id=organization_id, user_id=current_user.id)
+
+@router.delete("/{organization_id}/invitation", status_code=status.HTTP_204_NO_CONTENT)
+def decline(
+    organization_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    decline_invitation(db=db, organization_id=organization_id, user_id=current_user.id)
+
+@router.get("/{organization_id}/members", response_model=list[MemberOut])
+def list_members(
+    organization_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    get_membership(db, organization_id, current_user.id)
+    return get_organization_members(db=db, organization_id=organization_id)
+
+@router.put(
+    "/{organization_id}/members/{user_id}",
+    response_model=MemberOut,
+    description="Changes the role of a member, or invites a user who must then accept.",
+)
+def set_member(
+    organization_id: int,
+    user_id: int,
+    member: MemberIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    get_membership(db, organization_id, current_user.id, role=MemberRole.MANAGER)
+    return set_organization_member(db=db, organization_id=organization_id, user_id=user_id, role=member.role)
+
+@router.delete("/{organization_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_member(
+    organization_id: int,
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    get_membership(db, organization_id, current_user.id, role=MemberRole.MANAGER)
+    remove_organization_member(db=db, organization_id=organization_id, user_id=user_id)
+
+@router.post("/{organization_id}/farms", response_model=FarmOut)
+def add_farm(
+    organization_id: int,
+    farm: FarmCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    return create_farm(db=db, member=member, name=farm.name, user_id=farm.user_id)
+
+@router.get(
+    "/{organization_id}/farms",
+    response_model=list[FarmOut],
+    description="Returns every farm of the organization to managers, their own farms to members.",
+)
+def list_farms(
+    organization_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    owner = None if member.role == MemberRole.MANAGER else current_user.id
+    return get_organization_farms(db=db, organization_id=organization_id, user_id=owner)
+
+@router.delete("/{organization_id}/farms/{farm_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_farm(
+    organization_id: int,
+    farm_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    delete_farm(db=db, farm=get_organization_farm(db, member, farm_id))
+
+@router.put(
+    "/{organization_id}/farms/{farm_id}/fields/{field_id}",
+    response_model=FieldDemandOut,
+    description="Moves a field of the current user into their farm, and returns its current demand.",
+)
+def add_field(
+    organization_id: int,
+    farm_id: int,
+    field_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    return add_farm_field(
+        db=db,
+        farm=get_organization_farm(db, member, farm_id),
+        field_id=field_id,
+        user_id=current_user.id,
+    )
+
+@router.delete("/{organization_id}/farms/{farm_id}/fields/{field_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_field(
+    organization_id: int,
+    farm_id: int,
+    field_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    remove_farm_field(db=db, farm=get_organization_farm(db, member, farm_id), field_id=field_id)
+
+@router.get(
+    "/{organization_id}/demand",
+    response_model=OrganizationDemandOut,
+    description=(
+        "Daily water demand of every field of the organization's farms. The "
+        "totals are maintained as the weather, fields and crops change, so "
+        "this reads a single row; `farms=true` adds one row per farm."
+    ),
+)
+def get_organization_demand(
+    organization_id: int,
+    farms: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    get_membership(db, organization_id, current_user.id, role=MemberRole.MANAGER)
+    rollup = OrganizationDemandOut.model_validate(get_rollup(db, RollupLevel.ORGANIZATION, organization_id))
+    if farms:
+        farm_rollups = (
+            db.query(DemandRollup)
+            .join(Farm, Farm.id == DemandRollup.entity_id)
+            .filter(DemandRollup.level == RollupLevel.FARM, Farm.organization_id == organization_id)
+            .order_by(DemandRollup.entity_id)
+        )
+        rollup.farms = [DemandRollupOut.model_validate(farm_rollup) for farm_rollup in farm_rollups]
+    return rollup
+
+@router.get(
+    "/{organization_id}/farms/{farm_id}/demand",
+    response_model=FarmDemandOut,
+    description="Daily water demand of a farm and of each of its fields.",
+)
+def get_farm_demand(
+    organization_id: int,
+    farm_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    member = get_membership(db, organization_id, current_user.id)
+    farm = get_organization_farm(db, member, farm_id)
+    rollup = DemandRollupOut.model_validate(get_rollup(db, RollupLevel.FARM, farm.id))
+    return FarmDemandOut(
+        **rollup.model_dump(),
+        field_demands=[
+            FieldDemandOut.model_validate(field_demand)
+            for field_demand in get_farm_field_demands(db=db, farm_id=farm.id)
+        ],
+    )
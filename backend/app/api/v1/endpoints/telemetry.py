@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db.session import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.telemetry import (
+    DepletionInput,
+    DepletionOut,
+    IngestOut,
+    RollupInput,
+    RollupOut,
+)
+from app.services.irrigation_service import calculate_depletion, calculate_Dn
+from app.services.crop_service import get_user_crop_by_name
+from app.services.telemetry_service import (
+    Metric,
+    TelemetryBufferFull,
+    get_latest_rollup,
+    get_rollups,
+    parse_binary,
+    parse_ndjson,
+    telemetry_buffer,
+)
+
+router = APIRouter()
+
+@router.post(
+    "/readings",
+    response_model=IngestOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    description=(
+        "Ingest a batch of sensor readings, as NDJSON or, with an "
+        "application/octet-stream body, as packed binary records. "
+        "Readings are buffered and written in bulk."
+    ),
+)
+async def ingest_readings(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    body = await request.body()
+    parse = parse_binary if request.headers.get("content-type", "").startswith(
+        "application/octet-stream"
+    ) else parse_ndjson
+
+    try:
+        readings = await run_in_threadpool(parse, body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        accepted = telemetry_buffer.add(current_user.id, readings)
+    except TelemetryBufferFull:
+        raise HTTPException(status_code=503, detail="Telemetry buffer is full, retry later.")
+
+    return IngestOut(accepted=accepted, pending=telemetry_buffer.pending)
+
+@router.get("/rollups", response_model=list[RollupOut])
+def list_rollups(
+    data: RollupInput = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return [
+        RollupOut(
+            bucket=rollup.bucket,
+            count=rollup.count,
+            mean=round(rollup.total / rollup.count, 3),
+            minimum=rollup.minimum,
+            maximum=rollup.maximum,
+            last_value=rollup.last_value,
+        )
+        for rollup in get_rollups(db=db, user_id=current_user.id, **dict(data))
+    ]
+
+@router.get(
+    "/depletion",
+    response_model=DepletionOut,
+    description="Soil water depletion measured by a moisture sensor, compared with the net dose (Dn).",
+)
+def get_depletion(
+    data: DepletionInput = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    crop = get_user_crop_by_name(crop_name=data.crop_name, db=db, user_id=current_user.id)
+    if not crop:
+        raise HTTPException(status_code=404, detail="Crop not found")
+
+    rollup = get_latest_rollup(
+        db=db,
+        user_id=current_user.id,
+        sensor_id=data.sensor_id,
+        metric=Metric.MOISTURE,
+    )
+    if not rollup:
+        raise HTTPException(status_code=404, detail="No moisture readings for this sensor")
+
+    depletion = calculate_depletion(crop=crop, texture=data.texture, moisture=rollup.last_value)
+    Dn = calculate_Dn(db=db, crop_name=data.crop_name, texture=data.texture)
+
+    return DepletionOut(
+        moisture=rollup.last_value,
+        measured_at=rollup.last_ts,
+        depletion=round(depletion, 2),
+        Dn=round(Dn, 2),
+        irrigate=depletion >= Dn,
+    )
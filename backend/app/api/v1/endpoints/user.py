@@ -1,12 +1,28 @@
 from app.db.session import get_db
 from app.dependencies.auth import get_current_user, require_roles
 from app.models.user import User
-from app.schemas.user import UserCreate, UserOut
-from app.services.user_service import create_user, get_user_by_id, get_users, delete_user
+from app.schemas.user import (
+    OnboardingOut,
+    UserCreate,
+    UserListInput,
+    UserOut,
+    UserPage,
+    UserPageInput,
+)
+from app.services.onboarding_service import onboard_users
+from app.services.user_service import (
+    count_users,
+    create_user,
+    delete_user,
+    get_user_by_id,
+    get_users_page,
+    iter_users,
+)
 from app.utils.permissions import ensure_admin_or_self
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
 
 router = APIRouter()
 
@@ -21,12 +37,46 @@ def create(user: UserCreate, db: Session = Depends(get_db)):
 
 @router.get(
     "/",
-    response_model=List[UserOut],
+    response_model=UserPage,
+    dependencies=[Depends(require_roles("admin"))],
+    description=(
+        "Returns a page of registered users, ordered by id. Pass `next_cursor` "
+        "as `after` to get the next page. Only accessible to admin users."
+    )
+)
+def list_users(data: UserPageInput = Depends(), db: Session = Depends(get_db)):
+    users, next_cursor = get_users_page(db, **dict(data))
+    return UserPage(
+        items=users,
+        next_cursor=next_cursor,
+        approximate_count=count_users(db, role=data.role, email_prefix=data.email_prefix),
+    )
+
+@router.get(
+    "/export",
+    dependencies=[Depends(require_roles("admin"))],
+    response_class=StreamingResponse,
+    description="Streams all matching users as NDJSON. Only accessible to admin users."
+)
+def export_users(data: UserListInput = Depends()):
+    lines = (
+        UserOut.model_validate(user).model_dump_json() + "\n"
+        for user in iter_users(role=data.role, email_prefix=data.email_prefix)
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@router.post(
+    "/bulk",
+    response_model=OnboardingOut,
     dependencies=[Depends(require_roles("admin"))],
-    description="Returns a list of all registered users. Only accessible to admin users."
+    description=(
+        "Creates users from a CSV file with `email`, `password` and optional "
+        "`role` columns. Only accessible to admin users."
+    )
 )
-def list_users(db: Session = Depends(get_db)):
-    return get_users(db)
+def bulk_create(file: UploadFile, with_crops: bool = False, db: Session = Depends(get_db)):
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return onboard_users(db, lines, with_crops=with_crops)
 
 @router.get("/{user_id}", response_model=UserOut)
 def read_user(
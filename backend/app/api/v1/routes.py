@@ -1,5 +1,19 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import user, auth, climate, irrigation, crop
+from fastapi import APIRouter, Depends
+from app.api.v1.endpoints import (
+    admin,
+    auth,
+    climate,
+    crop,
+    dashboard,
+    field,
+    irrigation,
+    irrigation_event,
+    job,
+    organization,
+    telemetry,
+    user,
+)
+from app.dependencies.auth import require_roles
 
 api_router = APIRouter()
 api_router.include_router(user.router, prefix="/users", tags=["Users"])
@@ -7,3 +21,15 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 api_router.include_router(climate.router, prefix="/climate", tags=["Climate"])
 api_router.include_router(irrigation.router, prefix="/irrigation", tags=["Irrigation"])
 api_router.include_router(crop.router, prefix="/crops", tags=["Crops"])
+api_router.include_router(telemetry.router, prefix="/telemetry", tags=["Telemetry"])
+api_router.include_router(field.router, prefix="/fields", tags=["Fields"])
+api_router.include_router(irrigation_event.router, prefix="/events", tags=["Events"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(job.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(organization.router, prefix="/organizations", tags=["Organizations"])
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_roles("admin"))],
+)
@@ -3,12 +3,34 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
+    # Ed25519 private key signing the schedule bundles of field controllers,
+    # as the hex of its 32 bytes, e.g. from `os.urandom(32).hex()`.
+    # Controllers verify bundles with the public key only. Bundles are
+    # refused while it is unset.
+    BUNDLE_SIGNING_KEY: str = ""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
     DATABASE_URL: str = "sqlite:///./irrig.db"
 
+    # Worker processes running background jobs.
+    JOB_WORKERS: int = 2
+
     OPENWEATHERMAP_API_KEY: str = ""
 
+    # Quotas of the weather API, and the share of them left to job workers.
+    UPSTREAM_CALLS_PER_MINUTE: int = 600
+    UPSTREAM_CALLS_PER_HOUR: int = 5000
+    UPSTREAM_CALLS_PER_DAY: int = 10000
+    UPSTREAM_JOB_SHARE: float = 0.3
+
+    # Size [degrees] of the cells weather is fetched and cached for; every
+    # location of a cell shares the forecast at its center.
+    WEATHER_CELL_SIZE: float = 0.01
+
+    # "provider" uses the ET0 of the weather API, "local" computes it from
+    # the raw daily weather with the FAO-56 Penman-Monteith method.
+    ET0_SOURCE: str = "provider"
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,8 @@
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+
+def dialect_insert(bind, table: Table):
+    """Return an INSERT supporting `on_conflict_do_update` for the bind's dialect."""
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
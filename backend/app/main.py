@@ -1,6 +1,26 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from app.api.v1.routes import api_router
+from app.services.demand_service import demand_updater
+from app.services.job_service import job_runner, resume_jobs
+from app.utils.compression import CompressionMiddleware
+from app.utils.responses import FastJSONResponse
 
-app = FastAPI(title="Irrig Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    resume_jobs()
+    demand_updater.start()
+    yield
+    job_runner.shutdown()
+
+app = FastAPI(title="Irrig Backend", default_response_class=FastJSONResponse, lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 app.include_router(api_router, prefix="/api/v1")
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # As the default handler, but orjson writes the NaN and infinite inputs
+    # echoed in the errors as null instead of failing with a 500.
+    return FastJSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import (
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
 from app.db.base_class import Base
 from sqlalchemy.orm import relationship
 
@@ -18,3 +27,34 @@ class Crop(Base):
     )
 
     user = relationship("User", back_populates="crops")
+    # Crops without stages use the constant Kc.
+    stages = relationship(
+        "CropStages",
+        uselist=False,
+        lazy="selectin",
+        cascade="all, delete-orphan",
+    )
+
+class CropStages(Base):
+    """FAO-56 growth-stage Kc curve of a crop, from its planting date."""
+    __tablename__ = "crop_stages"
+
+    crop_name = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=False)
+
+    planting_date = Column(Date, nullable=False)
+    Kc_ini = Column(Float, nullable=False)
+    Kc_mid = Column(Float, nullable=False)
+    Kc_end = Column(Float, nullable=False)
+    L_ini = Column(Integer, nullable=False)     # [days]
+    L_dev = Column(Integer, nullable=False)     # [days]
+    L_mid = Column(Integer, nullable=False)     # [days]
+    L_late = Column(Integer, nullable=False)    # [days]
+
+    # Incremented on every change.
+    version = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("crop_name", "user_id"),
+        ForeignKeyConstraint(["crop_name", "user_id"], ["crops.name", "crops.user_id"]),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from app.db.base_class import Base
+from sqlalchemy.orm import relationship
+
+class Field(Base):
+    __tablename__ = "fields"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    crop_name = Column(String, nullable=False)
+
+    lat = Column(Float, nullable=False)
+    lon = Column(Float, nullable=False)
+    area = Column(Float, nullable=False)        # [ha]
+
+    texture = Column(String, nullable=False)
+    CEa = Column(Float, nullable=False)
+    EL = Column(Float, nullable=False)
+    CU = Column(Float, nullable=False)
+
+    user = relationship("User", back_populates="fields")
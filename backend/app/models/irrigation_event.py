@@ -0,0 +1,45 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
+from app.db.base_class import Base
+
+class IrrigationEvent(Base):
+    __tablename__ = "irrigation_events"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    field_id = Column(Integer, ForeignKey("fields.id"), nullable=False)
+    crop_name = Column(String, nullable=False)
+
+    applied_at = Column(DateTime, nullable=False)
+    applied = Column(Float, nullable=False)         # [mm]
+    recommended = Column(Float, nullable=False)     # NRt [mm]
+
+    __table_args__ = (
+        Index("ix_irrigation_events_user_id_id", "user_id", "id"),
+    )
+
+class IrrigationAggregate(Base):
+    """Per field, crop and week totals, maintained on every event write."""
+    __tablename__ = "irrigation_aggregates"
+
+    user_id = Column(Integer, nullable=False)
+    field_id = Column(Integer, nullable=False)
+    crop_name = Column(String, nullable=False)
+    week = Column(Date, nullable=False)             # Monday of the week
+
+    events = Column(Integer, nullable=False)
+    applied = Column(Float, nullable=False)
+    recommended = Column(Float, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "field_id", "crop_name", "week"),
+    )
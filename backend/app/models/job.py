@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+)
+from app.db.base_class import Base
+
+class Job(Base):
+    """A background computation, persisted so it survives restarts."""
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    params = Column(JSON, nullable=False)
+
+    status = Column(String, nullable=False, index=True)
+    progress = Column(Float, nullable=False, default=0)     # [0, 1]
+    result = Column(LargeBinary)                            # JSON body
+    error = Column(String)
+
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_jobs_user_id_created_at", "user_id", "created_at"),
+    )
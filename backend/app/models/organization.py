@@ -0,0 +1,76 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
+from app.db.base_class import Base
+
+class Organization(Base):
+    __tablename__ = "organizations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+
+class OrganizationMember(Base):
+    __tablename__ = "organization_members"
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    role = Column(String, nullable=False)       # "manager" or "member"
+    accepted = Column(Boolean, nullable=False, default=False)  # Invitations are pending until accepted
+
+    __table_args__ = (
+        PrimaryKeyConstraint("organization_id", "user_id"),
+    )
+
+class Farm(Base):
+    __tablename__ = "farms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)     # Owner of the farm and its fields
+    name = Column(String, nullable=False)
+
+class FarmField(Base):
+    """Membership of a field in a farm; a field is in at most one farm."""
+    __tablename__ = "farm_fields"
+
+    field_id = Column(Integer, ForeignKey("fields.id"), primary_key=True)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=False, index=True)
+
+class FieldDemand(Base):
+    """Last water demand of a field, as counted in the rollups of its farm and organization."""
+    __tablename__ = "field_demands"
+
+    field_id = Column(Integer, primary_key=True)
+    farm_id = Column(Integer, nullable=False, index=True)
+    organization_id = Column(Integer, nullable=False)
+
+    day = Column(Date)
+    NRt = Column(Float)                         # [mm/jour], None if it cannot be computed
+    area = Column(Float, nullable=False)        # [ha]
+    demand = Column(Float, nullable=False)      # [m3/jour]
+    updated_at = Column(DateTime, nullable=False)
+
+class DemandRollup(Base):
+    """Water demand totals of a farm or an organization, maintained on every field demand change."""
+    __tablename__ = "demand_rollups"
+
+    level = Column(String, nullable=False)      # "farm" or "organization"
+    entity_id = Column(Integer, nullable=False)
+
+    fields = Column(Integer, nullable=False)
+    pending = Column(Integer, nullable=False)   # Fields whose demand cannot be computed
+    area = Column(Float, nullable=False)        # [ha]
+    demand = Column(Float, nullable=False)      # [m3/jour]
+    updated_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("level", "entity_id"),
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+)
+from app.db.base_class import Base
+
+# Raw readings are stored in one table per month, so inserts only touch the
+# indexes of the current month and old months can be dropped as a whole.
+partition_metadata = MetaData()
+
+def readings_partition(month: str) -> Table:
+    """Return the raw readings table of a month, formatted as YYYYMM."""
+    name = f"telemetry_readings_{month}"
+    if name in partition_metadata.tables:
+        return partition_metadata.tables[name]
+    return Table(
+        name,
+        partition_metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("sensor_id", String, nullable=False),
+        Column("metric", String, nullable=False),
+        Column("ts", DateTime, nullable=False),
+        Column("value", Float, nullable=False),
+        Index(f"ix_{name}_sensor_ts", "user_id", "sensor_id", "ts"),
+    )
+
+class TelemetryRollup(Base):
+    __tablename__ = "telemetry_rollups"
+
+    user_id = Column(Integer, nullable=False)
+    sensor_id = Column(String, nullable=False)
+    metric = Column(String, nullable=False)
+    granularity = Column(String, nullable=False)   # "hour" or "day"
+    bucket = Column(DateTime, nullable=False)
+
+    count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    minimum = Column(Float, nullable=False)
+    maximum = Column(Float, nullable=False)
+    last_ts = Column(DateTime, nullable=False)
+    last_value = Column(Float, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "sensor_id", "metric", "granularity", "bucket"),
+    )
@@ -12,3 +12,4 @@ class User(Base):
     role = Column(String, default="user")       # e.g. "admin", "moderator", "user"
 
     crops = relationship("Crop", back_populates="user")
+    fields = relationship("Field", back_populates="user")
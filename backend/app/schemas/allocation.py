@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+
+class FieldRequirement(BaseModel):
+    id: str
+    # Besoins hydriques totaux [mm/jour]
+    NRt: float
+    # [ha]
+    area: float = Field(gt=0)
+    priority: float = Field(default=1, ge=0)
+    # Yield response factor (FAO-33)
+    Ky: float = Field(default=1, ge=0)
+
+class AllocationInput(BaseModel):
+    # Available water [m3]
+    budget: float = Field(ge=0)
+    fields: list[FieldRequirement]
+
+class FieldAllocation(BaseModel):
+    id: str
+    demand: float
+    allocated: float
+    fraction: float
+    yield_loss: float
+
+class AllocationOut(BaseModel):
+    budget: float
+    demand: float
+    allocated: float
+    yield_loss: float
+    fields: list[FieldAllocation]
@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class CacheStatsOut(BaseModel):
+    size: int
+    maxsize: int
+    # [s]
+    ttl: float
+    nbytes: int
+    hits: int
+    misses: int
+    hit_ratio: Optional[float]
+    evictions: int
+    expirations: int
+
+class CacheEntryOut(BaseModel):
+    # Center of the weather cell of the entry.
+    lat: float
+    lon: float
+    # [s]
+    age: float
+    nbytes: int
+
+class CacheEntryInput(BaseModel):
+    lat: float
+    lon: float
+
+class CacheRegionInput(BaseModel):
+    min_lat: Optional[float] = None
+    min_lon: Optional[float] = None
+    max_lat: Optional[float] = None
+    max_lon: Optional[float] = None
+
+class InvalidateOut(BaseModel):
+    invalidated: int
+
+class WarmInput(BaseModel):
+    coordinates: list[tuple[float, float]] = []
+    # Also warm the locations of every stored field.
+    fields: bool = False
+
+class WarmOut(BaseModel):
+    requested: int
+    already_cached: int
+    fetched: int
+    failed: int
+
+class ResizeInput(BaseModel):
+    maxsize: int = Field(ge=1)
+
+class QuotaBucketOut(BaseModel):
+    name: str
+    capacity: float
+    # [s]
+    period: float
+    remaining: float
+    used_ratio: float
+
+class QuotaPriorityOut(BaseModel):
+    used: float
+    deferred: int
+    # [s]
+    deferred_seconds: float
+    rejected: int
+
+class QuotaOut(BaseModel):
+    # Share of the provider's quotas given to the API process.
+    share: float
+    buckets: list[QuotaBucketOut]
+    # Fetches currently deferred.
+    waiting: int
+    priorities: dict[str, QuotaPriorityOut]
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+from datetime import date
 from typing import Optional
 
 class CropCreate(BaseModel):
@@ -20,3 +21,31 @@ class CropOut(BaseModel):
     CEemax: float
     H: float
     f: float
+
+class CropStagesIn(BaseModel):
+    planting_date: date
+    Kc_ini: float = Field(ge=0)
+    Kc_mid: float = Field(ge=0)
+    Kc_end: float = Field(ge=0)
+    # Stage lengths [days]
+    L_ini: int = Field(ge=0)
+    L_dev: int = Field(ge=0)
+    L_mid: int = Field(ge=0)
+    L_late: int = Field(ge=0)
+
+    @model_validator(mode="after")
+    def check_season(self):
+        if self.L_ini + self.L_dev + self.L_mid + self.L_late == 0:
+            raise ValueError("The season must last at least one day.")
+        return self
+
+class CropStagesOut(CropStagesIn):
+    version: int
+
+    class Config:
+        from_attributes = True
+
+class KcOut(BaseModel):
+    start: date
+    # Kc of each day from `start`.
+    Kc: list[float]
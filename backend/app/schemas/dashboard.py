@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from app.schemas.climate import ClimateOut
+from app.services.irrigation_service import Texture
+
+class DashboardInput(BaseModel):
+    lat: float
+    lon: float
+
+    CEa: float
+    EL: float
+    texture: Texture
+    CU: float
+
+class CropMetrics(BaseModel):
+    name: str
+    Kc: float
+    CEemax: float
+    H: float
+    f: float
+
+    NRn: float
+    Pe: float
+    ETc: float
+    Ea: float
+    NRt: float
+    Dn: float
+    Dt: float
+    I: float
+
+class DashboardOut(BaseModel):
+    climate: ClimateOut
+    crops: list[CropMetrics]
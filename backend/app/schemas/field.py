@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field as PydanticField
+from typing import Optional
+from app.services.irrigation_service import Texture
+
+class FieldCreate(BaseModel):
+    name: str
+    crop_name: str
+
+    lat: float
+    lon: float
+    # [ha]
+    area: float = PydanticField(gt=0)
+
+    texture: Texture
+    CEa: float
+    EL: float
+    CU: float
+
+class FieldUpdate(BaseModel):
+    name: Optional[str] = None
+    crop_name: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    area: Optional[float] = PydanticField(default=None, gt=0)
+    texture: Optional[Texture] = None
+    CEa: Optional[float] = None
+    EL: Optional[float] = None
+    CU: Optional[float] = None
+
+class FieldOut(FieldCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class HourlyOut(BaseModel):
+    field: int
+    # Local time of the first hour, with its UTC offset
+    start: str
+    hours: int
+    Dn: float
+    Ea: float
+    # First hour at which the deficit reaches Dn
+    due: Optional[str] = None
+    # Per hour, null without forecast [mm]
+    NRn: list[Optional[float]]
+    NRt: list[Optional[float]]
+    deficit: list[Optional[float]]
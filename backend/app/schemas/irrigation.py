@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from app.services.irrigation_service import Texture
+from enum import Enum
+from typing import Optional, Union
+from pydantic import BaseModel, FiniteFloat, Field, model_validator
+from app.services.irrigation_service import MAX_SWEEP_COMBINATIONS, Texture
 
 class NRnInput(BaseModel):
     crop_name: str
@@ -82,3 +84,100 @@ class IInput(BaseModel):
 
 class IOut(BaseModel):
     I: float
+
+
+class GridFormat(str, Enum):
+    BINARY = "binary"
+    JSON = "json"
+
+class GridInput(BaseModel):
+    crop_name: str
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+    resolution: float = 0.1
+
+    CEa: float
+    EL: float
+    texture: Texture
+    CU: float
+
+    format: GridFormat = GridFormat.BINARY
+
+class GridOut(BaseModel):
+    bands: list[str]
+    shape: list[int]
+    origin: list[float]
+    resolution: float
+    values: dict[str, list[list[Optional[float]]]]
+
+
+class SweepRange(BaseModel):
+    start: FiniteFloat
+    stop: FiniteFloat
+    step: FiniteFloat = Field(gt=0)
+
+    @property
+    def count(self) -> int:
+        return max(int(round((self.stop - self.start) / self.step)) + 1, 0)
+
+    @model_validator(mode="after")
+    def check_count(self):
+        # Checked before any value is built, as a tiny step would otherwise
+        # allocate a huge list. The span of finite bounds may still overflow.
+        steps = (self.stop - self.start) / self.step
+        if not steps < MAX_SWEEP_COMBINATIONS or self.count > MAX_SWEEP_COMBINATIONS:
+            raise ValueError(f"A range has at most {MAX_SWEEP_COMBINATIONS} values.")
+        return self
+
+    def values(self) -> list[float]:
+        return [round(self.start + i * self.step, 6) for i in range(self.count)]
+
+SweepValues = Union[list[FiniteFloat], SweepRange]
+
+class SweepInput(BaseModel):
+    crop_name: str
+    lat: float
+    lon: float
+
+    CEa: SweepValues
+    EL: SweepValues
+    CU: SweepValues
+    Fr: SweepValues = [1]
+    texture: list[Texture] = list(Texture)
+
+    @model_validator(mode="after")
+    def check_EL(self):
+        # The leaching fraction divides by EL.
+        if isinstance(self.EL, SweepRange):
+            positive = self.EL.start > 0 or not self.EL.count
+        else:
+            positive = all(value > 0 for value in self.EL)
+        if not positive:
+            raise ValueError("EL must be greater than 0.")
+        return self
+
+    def axes(self) -> dict[str, list]:
+        """Values of each axis of the sweep, in output order."""
+        axes = {
+            name: values.values() if isinstance(values, SweepRange) else values
+            for name, values in (
+                ("CEa", self.CEa),
+                ("EL", self.EL),
+                ("CU", self.CU),
+                ("Fr", self.Fr),
+            )
+        }
+        axes["texture"] = self.texture
+        return axes
+
+class SweepOut(BaseModel):
+    NRn: float
+    # Values of each axis, in the order of `shape`.
+    axes: dict[str, list]
+    shape: list[int]
+    # Row-major matrices of shape `shape`.
+    Ea: list[float]
+    NRt: list[float]
@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class EventCreate(BaseModel):
+    field_id: int
+    # [mm]
+    applied: float = Field(ge=0)
+    applied_at: Optional[datetime] = None
+    # NRt [mm], computed from the field settings when omitted.
+    recommended: Optional[float] = None
+
+class EventOut(BaseModel):
+    id: int
+    field_id: int
+    crop_name: str
+    applied_at: datetime
+    applied: float
+    recommended: float
+
+    class Config:
+        from_attributes = True
+
+class EventListInput(BaseModel):
+    field_id: Optional[int] = None
+    # Keyset cursor: only events with a lower id are returned.
+    before: Optional[int] = None
+    limit: int = Field(default=50, ge=1, le=500)
+
+class EventPage(BaseModel):
+    items: list[EventOut]
+    next_cursor: Optional[int]
+
+class SummaryGroup(str, Enum):
+    FIELD = "field"
+    CROP = "crop"
+    WEEK = "week"
+
+class SummaryInput(BaseModel):
+    user_id: Optional[int] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    group_by: SummaryGroup = SummaryGroup.WEEK
+
+class SummaryRow(BaseModel):
+    key: str
+    events: int
+    applied: float
+    recommended: float
+    # applied / recommended
+    ratio: Optional[float]
@@ -0,0 +1,74 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Optional
+from app.services.organization_service import MemberRole
+
+class OrganizationCreate(BaseModel):
+    name: str
+
+class OrganizationOut(OrganizationCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class MemberIn(BaseModel):
+    role: MemberRole = MemberRole.MEMBER
+
+class MemberOut(MemberIn):
+    user_id: int
+    # False while the user has not accepted the invitation
+    accepted: bool
+
+    class Config:
+        from_attributes = True
+
+class FarmCreate(BaseModel):
+    name: str
+    # Owner of the farm, the current user if None. Only managers can create
+    # farms for other members.
+    user_id: Optional[int] = None
+
+class FarmOut(BaseModel):
+    id: int
+    organization_id: int
+    user_id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+class FieldDemandOut(BaseModel):
+    field_id: int
+    farm_id: int
+    day: Optional[date] = None
+    # [mm/jour], None if it cannot be computed
+    NRt: Optional[float] = None
+    # [ha]
+    area: float
+    # [m3/jour]
+    demand: float
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DemandRollupOut(BaseModel):
+    entity_id: int
+    fields: int
+    # Fields whose demand cannot be computed, e.g. for lack of weather
+    pending: int
+    # [ha]
+    area: float
+    # [m3/jour]
+    demand: float
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class OrganizationDemandOut(DemandRollupOut):
+    farms: Optional[list[DemandRollupOut]] = None
+
+class FarmDemandOut(DemandRollupOut):
+    field_demands: list[FieldDemandOut]
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ZoneInput(BaseModel):
+    id: str
+    # Dose totale d’arrosage [mm]
+    Dt: float = Field(ge=0)
+    # Irrigation interval [jours]
+    I: float = Field(gt=0)
+    # [ha]
+    area: float = Field(gt=0)
+    # Valve flow rate [m3/h]
+    flow: float = Field(gt=0)
+    # Days since the zone was last irrigated, None when it is due anyway.
+    days_since_last: Optional[int] = Field(default=None, ge=0)
+
+class ScheduleInput(BaseModel):
+    zones: list[ZoneInput]
+    # [m3/h]
+    pump_capacity: float = Field(gt=0)
+    # Start of the irrigation window, in hours after midnight.
+    window_start: float = Field(default=4, ge=0, lt=24)
+    window_hours: float = Field(default=24, gt=0, le=24)
+    slot_minutes: int = Field(default=5, ge=1, le=60)
+
+class ZoneRun(BaseModel):
+    id: str
+    start: str
+    end: str
+    duration: float
+    volume: float
+
+class ScheduleOut(BaseModel):
+    runs: list[ZoneRun]
+    # Zones due today that do not fit in the window or the pump capacity.
+    unscheduled: list[str]
+    # Zones that are not due today.
+    skipped: list[str]
+    peak_flow: float
+    slot_minutes: int
+    # Pump load of each slot of the window [m3/h].
+    load: list[float]
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+from app.services.irrigation_service import Texture
+from app.services.telemetry_service import Granularity, Metric
+
+class IngestOut(BaseModel):
+    accepted: int
+    pending: int
+
+class RollupInput(BaseModel):
+    sensor_id: str
+    metric: Metric
+    granularity: Granularity = Granularity.HOUR
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+class RollupOut(BaseModel):
+    bucket: datetime
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+    last_value: float
+
+class DepletionInput(BaseModel):
+    sensor_id: str
+    crop_name: str
+    texture: Texture
+
+class DepletionOut(BaseModel):
+    moisture: float
+    measured_at: datetime
+    # Water needed to refill the soil to field capacity [mm]
+    depletion: float
+    Dn: float
+    irrigate: bool
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -10,4 +11,28 @@ class UserOut(BaseModel):
     role: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class UserListInput(BaseModel):
+    role: Optional[str] = None
+    email_prefix: Optional[str] = None
+
+class UserPageInput(UserListInput):
+    # Keyset cursor: only users with a higher id are returned.
+    after: Optional[int] = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+class UserPage(BaseModel):
+    items: List[UserOut]
+    next_cursor: Optional[int]
+    # Refreshed at most once a minute.
+    approximate_count: int
+
+class OnboardingError(BaseModel):
+    line: int
+    detail: str
+
+class OnboardingOut(BaseModel):
+    created: int
+    skipped: int
+    errors: List[OnboardingError]
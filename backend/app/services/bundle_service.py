@@ -0,0 +1,197 @@
+import hashlib
+import struct
+from functools import lru_cache
+from datetime import date, tzinfo
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.crop import Crop
+from app.models.field import Field
+from app.services.climate_service import (
+    FORECAST_DAYS,
+    HUMIDITY,
+    Climate,
+    WeatherPayload,
+    get_weather_data,
+)
+from app.services.crop_service import get_user_crop_by_name
+from app.services.kc_service import crop_Kc_window, kc_signature
+from app.services.timezone_service import get_timezone
+from app.services.irrigation_service import (
+    Texture,
+    calculate_crop_Dn,
+    calculate_FL,
+    calculate_Pe_array,
+    calculate_RL,
+    calculate_Rt,
+)
+
+# Layout version of the bundles, bumped on any change of their format.
+BUNDLE_VERSION = 2
+# Local days from today that the forecast covers in every timezone.
+MAX_BUNDLE_DAYS = FORECAST_DAYS - 1
+
+# Binary bundle: this header, then the float32 NRn, NRt and I series, then
+# the Ed25519 signature of everything before it.
+BUNDLE_MAGIC = b"IRRB"
+BUNDLE_HEADER = struct.Struct("<4sHIIHfff")
+
+# Built bundles, by ETag.
+bundle_cache = TTLCache(maxsize=4096, ttl=3600 * 24)
+
+class BundleFormat(str, Enum):
+    JSON = "json"
+    BINARY = "binary"
+
+@lru_cache(maxsize=1)
+def _signing_key(secret: str) -> Ed25519PrivateKey:
+    return Ed25519PrivateKey.from_private_bytes(bytes.fromhex(secret))
+
+def get_signing_key() -> Ed25519PrivateKey:
+    """The bundle signing key; never derived from SECRET_KEY, which signs login tokens.
+
+    Raises:
+        HTTPException: 503 if BUNDLE_SIGNING_KEY is unset or invalid.
+    """
+    try:
+        return _signing_key(settings.BUNDLE_SIGNING_KEY)
+    except ValueError:
+        print("[ERROR] BUNDLE_SIGNING_KEY must be set to the hex of a 32-byte Ed25519 private key.")
+        raise HTTPException(status_code=503, detail="Bundle signing is not configured.")
+
+def bundle_public_key() -> str:
+    """Hex of the raw Ed25519 public key controllers verify bundles with."""
+    return get_signing_key().public_key().public_bytes(Encoding.Raw, PublicFormat.Raw).hex()
+
+def sign_bundle(content: bytes) -> bytes:
+    return get_signing_key().sign(content)
+
+def bundle_etag(
+        field: Field,
+        crop: Crop,
+        payload: WeatherPayload,
+        tz: tzinfo,
+        start: date,
+        days: int,
+        format: BundleFormat,
+) -> str:
+    """Strong ETag of a bundle, a digest of every input it is computed from.
+
+    It is cheap to compute, so unchanged bundles are answered with 304
+    without being rebuilt.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((
+        BUNDLE_VERSION, format, start.toordinal(), days,
+        field.id, field.texture, field.CEa, field.EL, field.CU,
+        kc_signature(crop), crop.CEemax, crop.H, crop.f,
+        str(tz), payload.start_hour,
+    )).encode())
+    for values in (payload.hourly_et0, payload.hourly_precipitation, payload.current):
+        digest.update(values.tobytes())
+    return f'"{digest.hexdigest()}"'
+
+def calculate_bundle_series(
+        field: Field,
+        crop: Crop,
+        payload: WeatherPayload,
+        tz: tzinfo,
+        start: date,
+        days: int,
+) -> dict:
+    """Daily NRn, NRt and I of a field over `days` local days from `start`.
+
+    The climate class of the whole window is taken from the current
+    humidity, as the daily forecast has none.
+    """
+    texture = Texture(field.texture)
+    et0, precipitation = payload.daily_window(start, days, tz)
+    NRn = crop_Kc_window(crop, start, days) * et0 - calculate_Pe_array(precipitation)
+
+    climate = Climate.HUMID if payload.current[HUMIDITY] >= 50 else Climate.ARID
+    RL = calculate_RL(crop=crop, CEa=field.CEa)
+    FL = calculate_FL(EL=field.EL, RL=RL)
+    Ea = calculate_Rt(crop=crop, climate=climate, texture=texture) * field.CU * FL
+    Dn = calculate_crop_Dn(crop=crop, texture=texture)
+
+    return {
+        "Dn": Dn,
+        "Dt": Dn / Ea,
+        "Ea": Ea,
+        "NRn": NRn.astype(np.float32),
+        "NRt": (NRn / Ea).astype(np.float32),
+        "I": (NRn / Dn).astype(np.float32),
+    }
+
+def encode_bundle(field: Field, start: date, days: int, series: dict, etag: str, format: BundleFormat) -> bytes:
+    if format == BundleFormat.BINARY:
+        content = BUNDLE_HEADER.pack(
+            BUNDLE_MAGIC, BUNDLE_VERSION, field.id, start.toordinal(), days,
+            series["Dn"], series["Dt"], series["Ea"],
+        ) + b"".join(series[name].astype("<f4").tobytes() for name in ("NRn", "NRt", "I"))
+        return content + sign_bundle(content)
+
+    # Days without forecast are null.
+    bundle = {
+        "v": BUNDLE_VERSION,
+        "etag": etag.strip('"'),
+        "field": field.id,
+        "start": start.isoformat(),
+        "days": days,
+        "Dn": round(series["Dn"], 2),
+        "Dt": round(series["Dt"], 2),
+        "Ea": round(series["Ea"], 4),
+        "NRn": np.round(series["NRn"].astype(np.float64), 2),
+        "NRt": np.round(series["NRt"].astype(np.float64), 2),
+        "I": np.round(series["I"].astype(np.float64), 3),
+    }
+    # The signature covers the sorted, compact JSON of the other keys.
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+    bundle["sig"] = sign_bundle(orjson.dumps(bundle, option=options)).hex()
+    return orjson.dumps(bundle, option=options)
+
+def get_field_bundle(
+        db: Session,
+        field: Field,
+        days: int,
+        format: BundleFormat,
+        if_none_match: Optional[str] = None,
+) -> tuple[str, Optional[bytes]]:
+    """Return the ETag of a field's schedule bundle and its content.
+
+    The content is None when `if_none_match` already matches the ETag.
+    """
+    if not 1 <= days <= MAX_BUNDLE_DAYS:
+        raise HTTPException(status_code=400, detail=f"A bundle covers between 1 and {MAX_BUNDLE_DAYS} days.")
+
+    crop = get_user_crop_by_name(crop_name=field.crop_name, db=db, user_id=field.user_id)
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{field.crop_name}' not found.")
+    try:
+        payload = get_weather_data(field.lat, field.lon)
+    except ValueError:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
+
+    tz = get_timezone(field.lat, field.lon)
+    start = payload.local_date(tz)
+    etag = bundle_etag(field, crop, payload, tz, start, days, format)
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return etag, None
+
+    content = bundle_cache.get(etag)
+    if content is None:
+        series = calculate_bundle_series(field, crop, payload, tz, start, days)
+        content = bundle_cache[etag] = encode_bundle(field, start, days, series, etag, format)
+    return etag, content
@@ -1,8 +1,19 @@
-from cachetools import TTLCache, cached
+from cachetools import LRUCache, TTLCache, cached
+from cachetools.keys import hashkey
 from urllib.parse import urlencode
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from datetime import time as time_of_day
+import math
+import numpy as np
 import requests
+import threading
+import time
 from enum import Enum
-from typing import Dict
+from typing import Callable, Dict, Optional
+from app.core.config import settings
+from app.services.et0_service import calculate_ET0, wind_speed_2m
+from app.services.quota_service import QuotaExceeded, upstream_budget
+from app.services.timezone_service import get_timezone
 
 class Climate(Enum):
     ARID = "ARID"
@@ -10,6 +21,232 @@ class Climate(Enum):
 
 BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Order of the values kept in `WeatherPayload.current`.
+CURRENT_VARIABLES = ("precipitation", "temperature_2m", "relative_humidity_2m")
+PRECIPITATION, TEMPERATURE, HUMIDITY = range(len(CURRENT_VARIABLES))
+
+HOURLY_VARIABLES = ("et0_fao_evapotranspiration", "precipitation")
+# With ET0_SOURCE "local", the provider's ET0 is replaced by the radiation
+# that shapes the local daily ET0 over the hours.
+LOCAL_HOURLY_VARIABLES = ("shortwave_radiation", "precipitation")
+
+@cached(LRUCache(maxsize=4096), lock=threading.Lock())
+def local_day_hours(day_ordinal: int, days: int, tz: tzinfo) -> np.ndarray:
+    """Hours since the epoch of the `days` + 1 local midnights from a day.
+
+    Days are 23 or 25 hours long across DST changes. Offsets that are not
+    whole hours, e.g. +05:30, are rounded down to the hour of the series.
+    """
+    day = date.fromordinal(day_ordinal)
+    hours = np.array([
+        int(datetime.combine(day + timedelta(days=k), time_of_day(), tzinfo=tz).timestamp()) // 3600
+        for k in range(days + 1)
+    ])
+    hours.flags.writeable = False
+    return hours
+
+def _day_totals(values: np.ndarray, bounds: np.ndarray, covered: np.ndarray) -> np.ndarray:
+    """Sums of `values` between consecutive `bounds`, NaN where not `covered` or a value is missing."""
+    missing = np.concatenate(([0], np.cumsum(np.isnan(values))))
+    totals = np.concatenate(([0], np.cumsum(np.nan_to_num(values), dtype=np.float64)))
+    complete = covered & (missing[bounds[1:]] == missing[bounds[:-1]])
+    return np.where(complete, totals[bounds[1:]] - totals[bounds[:-1]], np.nan).astype(np.float32)
+
+class WeatherPayload:
+    """Compact, parsed form of an Open-Meteo forecast response.
+
+    Series are hourly float32 arrays in UTC, indexed by the hour offset from
+    `start_hour`, counted in hours since the epoch. Nothing depends on a
+    timezone, so one payload serves every location of its cell: daily
+    values are summed over the local days of the reader's timezone.
+    """
+    __slots__ = (
+        "latitude",
+        "longitude",
+        "start_hour",
+        "hourly_et0",
+        "hourly_precipitation",
+        "current",
+        "current_hour",
+        "fetched_at",
+    )
+
+    def __init__(
+            self,
+            latitude: float,
+            longitude: float,
+            start_hour: int,
+            hourly_et0: np.ndarray,
+            hourly_precipitation: np.ndarray,
+            current: np.ndarray,
+            current_hour: int,
+    ):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.start_hour = start_hour
+        self.hourly_et0 = hourly_et0
+        self.hourly_precipitation = hourly_precipitation
+        self.current = current
+        self.current_hour = current_hour
+        self.fetched_at = time.time()
+
+    def local_date(self, tz: tzinfo) -> date:
+        """Date of the current values in a timezone."""
+        return datetime.fromtimestamp(self.current_hour * 3600, tz).date()
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.hourly_et0.nbytes
+            + self.hourly_precipitation.nbytes
+            + self.current.nbytes
+        )
+
+    def et0_on(self, day: date, tz: tzinfo) -> Optional[float]:
+        """ET0 of a local day, None if the forecast does not cover it."""
+        et0, _ = self.daily_window(day, 1, tz)
+        return None if np.isnan(et0[0]) else float(et0[0])
+
+    def daily_window(self, day: date, days: int, tz: tzinfo) -> tuple[np.ndarray, np.ndarray]:
+        """Return the ET0 and precipitation totals of `days` local days from `day`.
+
+        Days not entirely covered by the forecast are NaN.
+        """
+        n = len(self.hourly_et0)
+        bounds = local_day_hours(day.toordinal(), days, tz) - self.start_hour
+        covered = (bounds[:-1] >= 0) & (bounds[1:] <= n)
+        bounds = np.clip(bounds, 0, n)
+        return (
+            _day_totals(self.hourly_et0, bounds, covered),
+            _day_totals(self.hourly_precipitation, bounds, covered),
+        )
+
+    def hourly_window(self, hour: int, hours: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the hourly ET0 and precipitation series for `hours` hours from `hour`.
+
+        Hours outside of the forecast range are NaN.
+        """
+        et0 = np.full(hours, np.nan, dtype=np.float32)
+        precipitation = np.full(hours, np.nan, dtype=np.float32)
+        start = hour - self.start_hour
+        lo, hi = max(start, 0), min(start + hours, len(self.hourly_et0))
+        if lo < hi:
+            et0[lo - start:hi - start] = self.hourly_et0[lo:hi]
+            precipitation[lo - start:hi - start] = self.hourly_precipitation[lo:hi]
+        return et0, precipitation
+
+def epoch_hour(time: str) -> int:
+    """Hours since the epoch of a UTC date-time in ISO format, e.g. "2024-06-01T13:00"."""
+    return int(datetime.fromisoformat(time).replace(tzinfo=timezone.utc).timestamp()) // 3600
+
+def _to_float32(values) -> np.ndarray:
+    # Open-Meteo reports missing values as null; keep them as NaN.
+    return np.array(
+        [np.nan if value is None else value for value in values],
+        dtype=np.float32,
+    )
+
+# Raw daily weather ET0 is computed from when ET0_SOURCE is "local", then
+# spread over the hours of each UTC day like the hourly shortwave radiation;
+# wind is requested in m/s and radiation comes in MJ/m².
+RAW_DAILY_VARIABLES = (
+    "temperature_2m_min",
+    "temperature_2m_max",
+    "relative_humidity_2m_min",
+    "relative_humidity_2m_max",
+    "wind_speed_10m_mean",
+    "shortwave_radiation_sum",
+)
+
+def _local_et0(data: Dict, start_ordinal: int, days: int) -> np.ndarray:
+    daily = data["daily"]
+    Tmin, Tmax, RHmin, RHmax, u10, Rs = (
+        _to_float32(daily[name][:days]) for name in RAW_DAILY_VARIABLES
+    )
+    start = date.fromordinal(start_ordinal).timetuple().tm_yday
+    return calculate_ET0(
+        Tmin=Tmin,
+        Tmax=Tmax,
+        RHmin=RHmin,
+        RHmax=RHmax,
+        u2=wind_speed_2m(u10),
+        latitude=data.get("latitude"),
+        # Wraps around the new year of a forecast spanning two years.
+        day_of_year=(start - 1 + np.arange(days)) % 365 + 1,
+        elevation=data.get("elevation") or 0,
+        Rs=Rs,
+    ).astype(np.float32)
+
+def _distribute_daily_et0(shape: np.ndarray, daily_et0: np.ndarray, hours: int) -> np.ndarray:
+    """Spread `daily_et0` over the `hours` hours of each UTC day, in proportion to `shape`.
+
+    Both series start at the same midnight. Days whose shape is missing,
+    partly or entirely, or all 0 are spread evenly; hours past the daily
+    series are NaN.
+    """
+    days = min(len(daily_et0), hours // 24)
+    hourly = np.zeros(days * 24, dtype=np.float64)
+    hourly[:min(len(shape), days * 24)] = shape[:days * 24]
+    hourly = hourly.reshape(days, 24)
+    totals = hourly.sum(axis=1, keepdims=True)
+    daily = daily_et0[:days, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(totals > 0, hourly * daily / totals, daily / 24)
+    return np.concatenate([scaled.ravel(), np.full(hours - days * 24, np.nan)]).astype(np.float32)
+
+def parse_weather_payload(data: Dict) -> WeatherPayload:
+    """Parse a raw Open-Meteo response, requested in UTC, into a `WeatherPayload`.
+
+    Raises:
+        ValueError: If the response is an error or misses required values.
+    """
+    if not data or "error" in data:
+        raise ValueError(f"Weather request failed: {data.get('error') if data else 'empty response'}")
+    if "current" not in data or "hourly" not in data:
+        raise ValueError("Missing 'current' or 'hourly' data in weather response.")
+
+    current = data["current"]
+    hourly = data["hourly"]
+
+    current_values = [current.get(name) for name in CURRENT_VARIABLES]
+    current_time = current.get("time")
+    if None in current_values or current_time is None:
+        raise ValueError("Missing values in 'current' weather data.")
+
+    hours = hourly.get("time") or []
+    if not hours or "precipitation" not in hourly:
+        raise ValueError("Missing hours or precipitation in 'hourly' weather data.")
+
+    # Hours are contiguous, only the first one needs to be parsed.
+    start_hour = epoch_hour(hours[0])
+
+    # ET0 computed locally from the raw daily weather if it was requested,
+    # otherwise the provider's.
+    daily = data.get("daily") or {}
+    dates = daily.get("time") or []
+    if (
+        dates
+        and all(name in daily for name in RAW_DAILY_VARIABLES)
+        and epoch_hour(dates[0] + "T00:00") == start_hour
+    ):
+        daily_et0 = _local_et0(data, date.fromisoformat(dates[0]).toordinal(), len(dates))
+        radiation = _to_float32(hourly.get("shortwave_radiation") or [])
+        hourly_et0 = _distribute_daily_et0(radiation, daily_et0, len(hours))
+    elif "et0_fao_evapotranspiration" in hourly:
+        hourly_et0 = _to_float32(hourly["et0_fao_evapotranspiration"][:len(hours)])
+    else:
+        raise ValueError("Missing ET0 in 'hourly' weather data.")
+
+    return WeatherPayload(
+        latitude=data.get("latitude"),
+        longitude=data.get("longitude"),
+        start_hour=start_hour,
+        hourly_et0=hourly_et0,
+        hourly_precipitation=_to_float32(hourly["precipitation"][:len(hours)]),
+        current=_to_float32(current_values),
+        current_hour=epoch_hour(current_time),
+    )
+
 def fetch_data(url: str):
     try:
         response = requests.get(url)
@@ -18,59 +255,200 @@ def fetch_data(url: str):
     except requests.exceptions.RequestException as e:
         return {"error": str(e)}
 
-weather_cache = TTLCache(maxsize=1024, ttl=3600 * 8)
-@cached(weather_cache)
-def get_weather_data(lat: float, lon: float) -> Dict:
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "daily": "et0_fao_evapotranspiration",
-        "current": "precipitation,temperature_2m,relative_humidity_2m",
-        "timezone": "Africa/Casablanca"
+def fetch_weather(url: str, locations: int = 1):
+    """`fetch_data` within the upstream budget; Open-Meteo counts each location as a call."""
+    try:
+        upstream_budget.acquire(cost=locations)
+    except QuotaExceeded as e:
+        return {"error": str(e)}
+    return fetch_data(url)
+
+# Open-Meteo accepts several coordinates per request; bulk lookups are split
+# into chunks of at most this many locations, fewer if the upstream budget
+# of the caller could never grant that many at once.
+BULK_FETCH_SIZE = 100
 
+# UTC days of forecast from the current one. Local days run up to 14 hours
+# off UTC, so a week of local days from today needs one more UTC day.
+FORECAST_DAYS = 8
+
+def _weather_params(latitude: str, longitude: str) -> Dict:
+    # Weather is fetched in UTC; local days are derived on read, see
+    # `WeatherPayload.daily_window`. The past day covers the start of the
+    # current local day east of UTC, the extra forecast day its end west
+    # of it.
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": ",".join(CURRENT_VARIABLES),
+        "hourly": ",".join(LOCAL_HOURLY_VARIABLES if settings.ET0_SOURCE == "local" else HOURLY_VARIABLES),
+        "wind_speed_unit": "ms",
+        "timezone": "GMT",
+        "past_days": 1,
+        "forecast_days": FORECAST_DAYS,
     }
-    url = f"{BASE_URL}?{urlencode(params)}"
-    return fetch_data(url)
+    if settings.ET0_SOURCE == "local":
+        params["daily"] = ",".join(RAW_DAILY_VARIABLES)
+    return params
 
-def get_climate(lat: float, lon: float):
-    try:
-        data = get_weather_data(lat, lon)
-        if not data or "current" not in data or "daily" not in data:
-            raise ValueError("Missing 'current' or 'daily' data in weather response.")
+class WeatherCache(TTLCache):
+    """TTLCache keeping hit, miss, eviction and expiration counts.
+
+    Access goes through `lock`, as the cache is shared by the API worker
+    threads and the admin endpoints iterate over it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Called with the key of every stored payload; must not block.
+        self.listeners: list[Callable[[tuple], None]] = []
 
-        current = data["current"]
-        daily = data["daily"]
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        for listener in self.listeners:
+            listener(key)
 
-        temperature = current.get("temperature_2m")
-        humidity = current.get("relative_humidity_2m")
-        precipitation = current.get("precipitation")
-        current_time = current.get("time")
+    def __getitem__(self, key):
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
 
-        if None in (temperature, humidity, precipitation, current_time):
-            raise ValueError("Missing values in 'current' weather data.")
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
-        current_date = current_time.split("T")[0]
+    def popitem(self):
+        # Only called by the cache itself, to make room for a new item.
+        item = super().popitem()
+        self.evictions += 1
+        return item
 
-        dates = daily.get("time", [])
-        et0_values = daily.get("et0_fao_evapotranspiration", [])
-        et0_today = None
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
 
-        if current_date in dates:
-            index = dates.index(current_date)
-            et0_today = et0_values[index] if index < len(et0_values) else None
+    def snapshot(self) -> list[tuple]:
+        """The live (key, value) pairs, without counting them as lookups."""
+        with self.lock:
+            return [(key, super(WeatherCache, self).__getitem__(key)) for key in list(self)]
 
-        climate = Climate.HUMID if humidity >= 50 else Climate.ARID
+    def resize(self, maxsize: int):
+        """Change the capacity of the cache, evicting items if it shrinks."""
+        with self.lock:
+            # cachetools keeps the capacity in a private, read-only attribute.
+            self._Cache__maxsize = maxsize
+            while self.currsize > maxsize:
+                self.popitem()
 
-        return {
-            "date": current_date,
-            "temperature": temperature,
-            "humidity": humidity,
-            "precipitation": precipitation,
-            "ET0": et0_today,
-            "climate": climate,
-        }
+def weather_cell(lat: float, lon: float) -> tuple[float, float]:
+    """Center of the `WEATHER_CELL_SIZE` cell of a location, where its weather is fetched."""
+    size = settings.WEATHER_CELL_SIZE
+    # The epsilon keeps locations on a cell edge, e.g. grid cell centers
+    # when the sizes match, in the cell above it.
+    return tuple(
+        round((math.floor(value / size + 1e-9) + 0.5) * size, 6)
+        for value in (lat, lon)
+    )
 
+def weather_key(lat: float, lon: float):
+    """Key of the `weather_cache` entry serving a location."""
+    return hashkey(*weather_cell(lat, lon))
 
+weather_cache = WeatherCache(maxsize=1024, ttl=3600 * 8)
+@cached(weather_cache, key=weather_key, lock=weather_cache.lock)
+def get_weather_data(lat: float, lon: float) -> WeatherPayload:
+    url = f"{BASE_URL}?{urlencode(_weather_params(*weather_cell(lat, lon)))}"
+    # Parsing raises on failed requests, so errors are never cached.
+    return parse_weather_payload(fetch_weather(url))
+
+def get_weather_data_bulk(
+        coordinates: list[tuple[float, float]]
+) -> list[Optional[WeatherPayload]]:
+    """Resolve weather for many locations with as few upstream calls as possible.
+
+    Locations are grouped by weather cell. Cached cells are served from
+    `weather_cache`, the remaining ones are fetched in chunks of up to
+    `BULK_FETCH_SIZE` and stored in the cache, so later `get_weather_data`
+    calls in the same cells are hits.
+
+    Returns:
+        list: One payload per coordinate, None where the upstream failed.
+    """
+    results: list[Optional[WeatherPayload]] = [None] * len(coordinates)
+    # Indices of the coordinates in each cell.
+    cells: dict[tuple[float, float], list[int]] = {}
+    for i, (lat, lon) in enumerate(coordinates):
+        cells.setdefault(weather_cell(lat, lon), []).append(i)
+
+    missing: list[tuple[float, float]] = []
+    with weather_cache.lock:
+        for cell, indices in cells.items():
+            payload = weather_cache.get(hashkey(*cell))
+            if payload is None:
+                missing.append(cell)
+            else:
+                for i in indices:
+                    results[i] = payload
+
+    chunk_size = max(1, min(BULK_FETCH_SIZE, int(upstream_budget.max_cost())))
+    for start in range(0, len(missing), chunk_size):
+        chunk = missing[start:start + chunk_size]
+        params = _weather_params(
+            ",".join(str(lat) for lat, _ in chunk),
+            ",".join(str(lon) for _, lon in chunk),
+        )
+        data = fetch_weather(f"{BASE_URL}?{urlencode(params)}", locations=len(chunk))
+        # A single location is answered with an object, several with a list.
+        items = data if isinstance(data, list) else [data] * len(chunk)
+        for cell, item in zip(chunk, items):
+            try:
+                payload = parse_weather_payload(item)
+            except ValueError as e:
+                print(f"[ERROR] Failed to get weather data for {cell}: {e}")
+                continue
+            with weather_cache.lock:
+                weather_cache[hashkey(*cell)] = payload
+            for i in cells[cell]:
+                results[i] = payload
+
+    return results
+
+def climate_from_payload(data: WeatherPayload, tz: tzinfo) -> Dict:
+    """Current climate of a weather payload in a timezone, as returned by `get_climate`."""
+    precipitation, temperature, humidity = (
+        round(float(value), 2) for value in data.current
+    )
+    current_date = data.local_date(tz)
+    et0_today = data.et0_on(current_date, tz)
+    if et0_today is not None:
+        et0_today = round(et0_today, 2)
+
+    climate = Climate.HUMID if humidity >= 50 else Climate.ARID
+
+    return {
+        "date": current_date.isoformat(),
+        "temperature": temperature,
+        "humidity": humidity,
+        "precipitation": precipitation,
+        "ET0": et0_today,
+        "climate": climate,
+    }
+
+def get_climate(lat: float, lon: float):
+    try:
+        return climate_from_payload(get_weather_data(lat, lon), get_timezone(lat, lon))
     except Exception as e:
         print(f"[ERROR] Failed to get climate data for ({lat}, {lon}): {e}")
         return None
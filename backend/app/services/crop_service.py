@@ -1,6 +1,13 @@
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.models.crop import Crop
-from app.schemas.crop import CropCreate, CropUpdate
+from app.models.crop import Crop, CropStages
+from app.schemas.crop import CropCreate, CropStagesIn, CropUpdate
+from app.services.demand_service import demand_updater
+from app.services.push_service import recommendation_hub
+
+def _notify_crop(user_id: int, crop_name: Optional[str] = None):
+    recommendation_hub.notify_crop(user_id, crop_name)
+    demand_updater.notify_crop(user_id, crop_name)
 
 
 default_crops = [
@@ -61,6 +68,7 @@ def update_user_crop(
 
     db.commit()
     db.refresh(crop)
+    _notify_crop(user_id, crop_name)
 
     return crop
 
@@ -81,6 +89,7 @@ def create_user_crops(db: Session, crops: list[CropCreate], user_id: int):
 def delete_user_crop(db: Session, crop: Crop):
     db.delete(crop)
     db.commit()
+    _notify_crop(crop.user_id, crop.name)
 
 
 def delete_user_crop_by_name(db: Session, crop_name: str, user_id: int):
@@ -93,6 +102,26 @@ def delete_user_crop_by_name(db: Session, crop_name: str, user_id: int):
         delete_user_crop(db=db, crop=crop)
 
 
+def set_user_crop_stages(db: Session, crop: Crop, stages: CropStagesIn):
+    if crop.stages is None:
+        crop.stages = CropStages(version=0)
+    for key, value in stages.model_dump().items():
+        setattr(crop.stages, key, value)
+    crop.stages.version += 1
+
+    db.commit()
+    db.refresh(crop)
+    _notify_crop(crop.user_id, crop.name)
+    return crop.stages
+
+def delete_user_crop_stages(db: Session, crop: Crop):
+    crop.stages = None
+    db.commit()
+    _notify_crop(crop.user_id, crop.name)
+
+
 def reset_user_crops(db: Session, user_id: int):
+    db.query(CropStages).filter(CropStages.user_id == user_id).delete()
     db.query(Crop).filter(Crop.user_id == user_id).delete()
     create_user_crops(db=db, crops=default_crops, user_id=user_id)
+    _notify_crop(user_id)
@@ -0,0 +1,212 @@
+import threading
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.field import Field
+from app.models.organization import DemandRollup, Farm, FarmField, FieldDemand
+from app.services.allocation_service import M3_PER_MM_HA
+from app.services.climate_service import get_weather_data_bulk, weather_cache, weather_key
+from app.services.irrigation_service import calculate_fields_metrics
+from app.services.quota_service import Priority, upstream_priority
+
+# Seconds between checks for expired weather of the fields in farms.
+REFRESH_INTERVAL = 300
+
+class RollupLevel(str, Enum):
+    FARM = "farm"
+    ORGANIZATION = "organization"
+
+# Field demands are read, then their difference is added to the rollups;
+# writes are serialized so that concurrent updates of a field are not
+# counted twice.
+_write_lock = threading.Lock()
+
+def get_rollup(db: Session, level: RollupLevel, entity_id: int) -> DemandRollup:
+    rollup = db.get(DemandRollup, (level.value, entity_id))
+    if rollup is None:
+        rollup = DemandRollup(
+            level=level.value,
+            entity_id=entity_id,
+            fields=0,
+            pending=0,
+            area=0,
+            demand=0,
+            updated_at=datetime.utcnow(),
+        )
+        db.add(rollup)
+        db.flush()
+    return rollup
+
+def _count(db: Session, row: FieldDemand, sign: int):
+    """Add (sign=1) or remove (sign=-1) a field demand from its farm and organization totals."""
+    for level, entity_id in (
+        (RollupLevel.FARM, row.farm_id),
+        (RollupLevel.ORGANIZATION, row.organization_id),
+    ):
+        rollup = get_rollup(db, level, entity_id)
+        rollup.fields += sign
+        rollup.pending += sign * (row.NRt is None)
+        if rollup.fields:
+            rollup.area += sign * row.area
+            rollup.demand += sign * row.demand
+        else:
+            # Resets the rounding errors left by the additions.
+            rollup.area = rollup.demand = 0
+        rollup.updated_at = row.updated_at
+
+def update_field_demands(db: Session, field_ids: Iterable[int]):
+    """Recompute the demand of some fields and apply the differences to the rollups.
+
+    Fields that are no longer in a farm, or deleted, are removed from the
+    rollups they were counted in.
+    """
+    field_ids = set(field_ids)
+    if not field_ids:
+        return
+    members = (
+        db.query(Field, Farm)
+        .join(FarmField, FarmField.field_id == Field.id)
+        .join(Farm, Farm.id == FarmField.farm_id)
+        .filter(Field.id.in_(field_ids))
+        .all()
+    )
+    metrics = calculate_fields_metrics(db, [field for field, _ in members])
+    now = datetime.utcnow()
+
+    with _write_lock:
+        for row in db.query(FieldDemand).filter(FieldDemand.field_id.in_(field_ids)):
+            _count(db, row, -1)
+            db.delete(row)
+        db.flush()
+
+        for field, farm in members:
+            values = metrics[field.id]
+            NRt = None if values is None else values["NRt"]
+            row = FieldDemand(
+                field_id=field.id,
+                farm_id=farm.id,
+                organization_id=farm.organization_id,
+                day=None if values is None else date.fromisoformat(values["date"]),
+                NRt=NRt,
+                area=field.area,
+                demand=0 if NRt is None else max(NRt, 0) * field.area * M3_PER_MM_HA,
+                updated_at=now,
+            )
+            db.add(row)
+            _count(db, row, 1)
+        db.commit()
+
+def _refresh_weather(cells: list[tuple]):
+    with upstream_priority(Priority.PREFETCH):
+        get_weather_data_bulk(cells)
+
+class DemandUpdater:
+    """Keeps the demand rollups up to date from a background thread.
+
+    Weather refreshes and field or crop edits only mark the fields they
+    change; the thread recomputes those fields in one batch and adds the
+    differences to their farm and organization, so rollups are never
+    recomputed on read. Expired weather of the fields in farms is refetched,
+    so their demand follows the forecast without any request.
+
+    The `notify_*` methods may be called from any thread and do not block.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Fields in farms by weather cache key, as of the last pass.
+        self._cells: dict[tuple, set[int]] = {}
+        # Until the first pass has indexed the cells, every notification is
+        # kept.
+        self._ready = False
+
+        self._dirty_cells: set[tuple] = set()
+        self._dirty_crops: set[tuple[int, Optional[str]]] = set()
+        self._dirty_fields: set[int] = set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="demand-updater", daemon=True)
+                self._thread.start()
+
+    def _mark(self, dirty: set, item):
+        with self._lock:
+            dirty.add(item)
+        self.start()
+        self._wake.set()
+
+    def notify_cell(self, cell: tuple):
+        if not self._ready or cell in self._cells:
+            self._mark(self._dirty_cells, cell)
+
+    def notify_crop(self, user_id: int, crop_name: Optional[str] = None):
+        """Signal a changed crop, or every crop of the user if `crop_name` is None."""
+        if not self._ready or self._cells:
+            self._mark(self._dirty_crops, (user_id, crop_name))
+
+    def notify_field(self, field_id: int):
+        # Not filtered, as a field leaving a farm must still be removed.
+        self._mark(self._dirty_fields, field_id)
+
+    def _take_dirty(self, db: Session) -> set[int]:
+        with self._lock:
+            cells, self._dirty_cells = self._dirty_cells, set()
+            crops, self._dirty_crops = self._dirty_crops, set()
+            field_ids, self._dirty_fields = self._dirty_fields, set()
+
+        for cell in cells:
+            field_ids |= self._cells.get(cell, set())
+        conditions = []
+        for user_id, crop_name in crops:
+            condition = Field.user_id == user_id
+            if crop_name is not None:
+                condition = and_(condition, Field.crop_name == crop_name)
+            conditions.append(condition)
+        if conditions:
+            field_ids |= {
+                field_id
+                for (field_id,) in db.query(Field.id).join(FarmField, FarmField.field_id == Field.id).filter(or_(*conditions))
+            }
+        return field_ids
+
+    def update(self):
+        """Run one pass: refetch expired weather, then recompute the marked fields."""
+        db = SessionLocal()
+        try:
+            cells: dict[tuple, set[int]] = {}
+            for field_id, lat, lon in db.query(Field.id, Field.lat, Field.lon).join(
+                FarmField, FarmField.field_id == Field.id
+            ):
+                cells.setdefault(weather_key(lat, lon), set()).add(field_id)
+            self._cells = cells
+            # Storing the refetched entries marks their cells, which are
+            # recomputed below.
+            expired = [cell for cell in self._cells if cell not in weather_cache]
+            if expired:
+                _refresh_weather(expired)
+
+            update_field_demands(db, self._take_dirty(db))
+            self._ready = True
+        finally:
+            db.close()
+
+    def _run(self):
+        # The first pass runs at once, then after each wake-up or interval.
+        while True:
+            try:
+                self.update()
+            except Exception as e:
+                print(f"[ERROR] Failed to update water demand rollups: {e}")
+            self._wake.wait(REFRESH_INTERVAL)
+            self._wake.clear()
+
+demand_updater = DemandUpdater()
+weather_cache.listeners.append(demand_updater.notify_cell)
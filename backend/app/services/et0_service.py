@@ -0,0 +1,112 @@
+"""Reference evapotranspiration (ET0) with the FAO-56 Penman–Monteith method.
+
+Every function works on numpy arrays and broadcasts its arguments, so one
+call computes ET0 for many locations and days at once, e.g. with latitudes
+of shape (locations, 1) and days of the year of shape (days,).
+
+Equation numbers refer to FAO Irrigation and Drainage Paper 56, chapter 3.
+"""
+from typing import Optional
+import numpy as np
+
+SOLAR_CONSTANT = 0.0820         # Gsc [MJ/m²/min]
+STEFAN_BOLTZMANN = 4.903e-9     # σ [MJ/K⁴/m²/day]
+ALBEDO = 0.23                   # Reference grass crop
+HARGREAVES_KRS = 0.16           # Radiation adjustment coefficient, interior locations [°C^-0.5]
+
+def atmospheric_pressure(elevation) -> np.ndarray:
+    """Atmospheric pressure [kPa] at an elevation [m] (eq. 7)."""
+    return 101.3 * ((293 - 0.0065 * np.asarray(elevation, dtype=np.float64)) / 293) ** 5.26
+
+def psychrometric_constant(pressure) -> np.ndarray:
+    """γ [kPa/°C] from the atmospheric pressure [kPa] (eq. 8)."""
+    return 0.665e-3 * pressure
+
+def saturation_vapour_pressure(T) -> np.ndarray:
+    """e°(T) [kPa] at an air temperature [°C] (eq. 11)."""
+    return 0.6108 * np.exp(17.27 * T / (T + 237.3))
+
+def vapour_pressure_slope(T) -> np.ndarray:
+    """Δ [kPa/°C], slope of the saturation vapour pressure curve at T [°C] (eq. 13)."""
+    return 4098 * saturation_vapour_pressure(T) / (T + 237.3) ** 2
+
+def wind_speed_2m(uz, z: float = 10) -> np.ndarray:
+    """Wind speed at 2 m [m/s] from a speed measured z meters above ground (eq. 47)."""
+    return uz * 4.87 / np.log(67.8 * z - 5.42)
+
+def extraterrestrial_radiation(latitude, day_of_year) -> np.ndarray:
+    """Ra [MJ/m²/day] at a latitude [°] on a day of the year (eq. 21-25)."""
+    phi = np.radians(latitude)
+    angle = 2 * np.pi * np.asarray(day_of_year) / 365
+    dr = 1 + 0.033 * np.cos(angle)
+    delta = 0.409 * np.sin(angle - 1.39)
+    # Clipped for polar days and nights, where the sun never sets or rises.
+    ws = np.arccos(np.clip(-np.tan(phi) * np.tan(delta), -1, 1))
+    return (24 * 60 / np.pi) * SOLAR_CONSTANT * dr * (
+        ws * np.sin(phi) * np.sin(delta) + np.cos(phi) * np.cos(delta) * np.sin(ws)
+    )
+
+def net_radiation(Rs, Ra, Tmin, Tmax, ea, elevation) -> np.ndarray:
+    """Rn [MJ/m²/day] from the incoming solar radiation Rs [MJ/m²/day] (eq. 37-40)."""
+    Rso = (0.75 + 2e-5 * elevation) * Ra
+    Rns = (1 - ALBEDO) * Rs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_radiation = np.clip(np.where(Rso > 0, Rs / Rso, 1), 0.3, 1)
+    Rnl = (
+        STEFAN_BOLTZMANN
+        * ((Tmax + 273.16) ** 4 + (Tmin + 273.16) ** 4) / 2
+        * (0.34 - 0.14 * np.sqrt(ea))
+        * (1.35 * relative_radiation - 0.35)
+    )
+    return Rns - Rnl
+
+def calculate_ET0(
+        Tmin,
+        Tmax,
+        RHmin,
+        RHmax,
+        u2,
+        latitude,
+        day_of_year,
+        elevation=0,
+        Rs: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculate the daily reference evapotranspiration (ET0).
+
+    Parameters:
+        Tmin, Tmax: Daily minimum and maximum air temperature at 2 m [°C].
+        RHmin, RHmax: Daily minimum and maximum relative humidity [%].
+        u2: Mean wind speed at 2 m [m/s].
+        latitude: Latitude [°].
+        day_of_year: Day of the year, 1 to 366.
+        elevation: Elevation above sea level [m].
+        Rs: Incoming solar radiation [MJ/m²/day]. Estimated from the
+            temperature range with the Hargreaves formula (eq. 50) if None.
+
+    Returns:
+        np.ndarray: ET0 in [mm/day], of the broadcast shape of the
+        arguments, NaN where an input is missing.
+    """
+    Tmin, Tmax, RHmin, RHmax, u2 = (
+        np.asarray(values, dtype=np.float64) for values in (Tmin, Tmax, RHmin, RHmax, u2)
+    )
+    elevation = np.asarray(elevation, dtype=np.float64)
+    Tmean = (Tmin + Tmax) / 2
+
+    gamma = psychrometric_constant(atmospheric_pressure(elevation))
+    delta = vapour_pressure_slope(Tmean)
+    e_Tmin = saturation_vapour_pressure(Tmin)
+    e_Tmax = saturation_vapour_pressure(Tmax)
+    es = (e_Tmin + e_Tmax) / 2
+    ea = (e_Tmin * RHmax / 100 + e_Tmax * RHmin / 100) / 2
+
+    Ra = extraterrestrial_radiation(latitude, day_of_year)
+    if Rs is None:
+        Rs = HARGREAVES_KRS * np.sqrt(np.maximum(Tmax - Tmin, 0)) * Ra
+    Rn = net_radiation(np.asarray(Rs, dtype=np.float64), Ra, Tmin, Tmax, ea, elevation)
+
+    # The soil heat flux G is negligible at a daily step (eq. 42).
+    ET0 = (
+        0.408 * delta * Rn + gamma * 900 / (Tmean + 273) * u2 * (es - ea)
+    ) / (delta + gamma * (1 + 0.34 * u2))
+    return np.maximum(ET0, 0)
@@ -0,0 +1,60 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.models.field import Field
+from app.models.irrigation_event import IrrigationAggregate, IrrigationEvent
+from app.models.organization import FarmField
+from app.schemas.field import FieldCreate, FieldUpdate
+from app.services.crop_service import get_user_crop_by_name
+from app.services.irrigation_service import calculate_fields_metrics
+from app.services.demand_service import demand_updater
+from app.services.push_service import recommendation_hub
+
+def _notify_field(field_id: int):
+    recommendation_hub.notify_field(field_id)
+    demand_updater.notify_field(field_id)
+
+def get_user_fields(db: Session, user_id: int):
+    return db.query(Field).filter(Field.user_id == user_id).order_by(Field.id).all()
+
+def get_user_field(db: Session, field_id: int, user_id: int):
+    return db.query(Field).filter(
+        Field.user_id == user_id,
+        Field.id == field_id
+    ).first()
+
+def create_user_field(db: Session, field: FieldCreate, user_id: int):
+    db_field = Field(user_id=user_id, **field.model_dump(mode="json"))
+    db.add(db_field)
+    db.commit()
+    db.refresh(db_field)
+    return db_field
+
+def update_user_field(db: Session, field: Field, field_update: FieldUpdate):
+    for key, value in field_update.model_dump(mode="json", exclude_unset=True).items():
+        setattr(field, key, value)
+
+    db.commit()
+    db.refresh(field)
+    _notify_field(field.id)
+    return field
+
+def delete_user_field(db: Session, field: Field):
+    db.query(IrrigationAggregate).filter(IrrigationAggregate.field_id == field.id).delete()
+    db.query(IrrigationEvent).filter(IrrigationEvent.field_id == field.id).delete()
+    db.query(FarmField).filter(FarmField.field_id == field.id).delete()
+    db.delete(field)
+    db.commit()
+    _notify_field(field.id)
+
+def calculate_field_NRt(db: Session, field: Field) -> float:
+    """Calculate the total water requirement (NRt) recommended for a field today.
+
+    The crop is the one of the field's owner.
+    """
+    crop = get_user_crop_by_name(crop_name=field.crop_name, db=db, user_id=field.user_id)
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{field.crop_name}' not found.")
+    metrics = calculate_fields_metrics(db, [field])[field.id]
+    if metrics is None:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
+    return metrics["NRt"]
@@ -0,0 +1,238 @@
+import math
+from datetime import date, tzinfo
+from typing import Optional
+
+import numpy as np
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from app.models.crop import Crop
+from app.services.climate_service import (
+    HUMIDITY,
+    PRECIPITATION,
+    WeatherPayload,
+    get_weather_data_bulk,
+)
+from app.services.kc_service import crop_Kc_window, kc_signature
+from app.services.timezone_service import get_timezone
+from app.services.irrigation_service import (
+    RT_TEXTURES,
+    Texture,
+    calculate_FL,
+    calculate_Pe_array,
+    calculate_RL,
+    calculate_Rt_table,
+)
+
+# Bands of the requirement raster, in output order.
+GRID_BANDS = ("NRn_today", "NRt_today", "NRn_week", "NRt_week")
+WEEK_DAYS = 7
+
+# Rasters are cached in square tiles of TILE_SIZE cells aligned on the global
+# grid. Tiles are filled lazily: a request only fetches and computes its own
+# cells not in the cache yet, so panning a map only computes the newly
+# exposed cells.
+TILE_SIZE = 16
+MAX_GRID_CELLS = 10_000
+MIN_RESOLUTION = 0.01
+
+tile_cache = TTLCache(maxsize=4096, ttl=3600)
+
+def calculate_requirements(
+        crop: Crop,
+        payloads: list[Optional[WeatherPayload]],
+        timezones: list[tzinfo],
+        CEa: float,
+        EL: float,
+        texture: Texture,
+        CU: float,
+        Fr: float = 1,
+) -> np.ndarray:
+    """Vectorized NRn/NRt for one crop over many weather payloads.
+
+    Args:
+        crop (Crop): The crop, with its Kc, CEemax, height (H), and f values.
+        payloads (list): Weather of each location, None where unavailable.
+        timezones (list): Timezone of each location, its days being local.
+        CEa (float): Conductivité électrique de l'eau d’arrosage en [dS/m].
+        EL (float): L’efficacité de lavage.
+        texture (Texture): The soil texture.
+        CU (float): Coefficient d'uniformité.
+        Fr (float): Facteur de réduction.
+
+    Returns:
+        np.ndarray: float32 array of shape (len(GRID_BANDS), len(payloads)),
+        NaN where the weather is unavailable.
+    """
+    n = len(payloads)
+    Kc = np.full((n, WEEK_DAYS), np.nan, dtype=np.float32)
+    et0_today = np.full(n, np.nan, dtype=np.float32)
+    precipitation_now = np.full(n, np.nan, dtype=np.float32)
+    humid = np.zeros(n, dtype=np.intp)
+    et0_week = np.full((n, WEEK_DAYS), np.nan, dtype=np.float32)
+    precipitation_week = np.full((n, WEEK_DAYS), np.nan, dtype=np.float32)
+
+    for k, (payload, tz) in enumerate(zip(payloads, timezones)):
+        if payload is None:
+            continue
+        today = payload.local_date(tz)
+        Kc[k] = crop_Kc_window(crop, today, WEEK_DAYS)
+        precipitation_now[k] = payload.current[PRECIPITATION]
+        humid[k] = payload.current[HUMIDITY] >= 50
+        et0_week[k], precipitation_week[k] = payload.daily_window(today, WEEK_DAYS, tz)
+        et0_today[k] = et0_week[k, 0]
+
+    NRn_today = Kc[:, 0] * et0_today - calculate_Pe_array(precipitation_now)
+    NRn_week = (Kc * et0_week - calculate_Pe_array(precipitation_week)).sum(axis=1)
+
+    RL = calculate_RL(crop=crop, CEa=CEa)
+    FL = calculate_FL(EL=EL, RL=RL)
+    Rt = calculate_Rt_table(crop)[humid, RT_TEXTURES.index(texture)]
+    Ea = Rt * CU * Fr * FL
+
+    return np.stack(
+        [NRn_today, NRn_today / Ea, NRn_week, NRn_week / Ea]
+    ).astype(np.float32)
+
+def _cell_index(value: float, resolution: float) -> int:
+    # The epsilon keeps bounds that sit exactly on a cell edge in that cell.
+    return math.floor(value / resolution + 1e-9)
+
+def _empty_tile() -> tuple[np.ndarray, np.ndarray]:
+    """Values of a tile, NaN until computed, and the mask of its computed cells."""
+    return (
+        np.full((len(GRID_BANDS), TILE_SIZE, TILE_SIZE), np.nan, dtype=np.float32),
+        np.zeros((TILE_SIZE, TILE_SIZE), dtype=bool),
+    )
+
+def grid_cells(
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        resolution: float,
+        max_cells: int = MAX_GRID_CELLS,
+) -> tuple[int, int, int, int]:
+    """Global indices of the first and last rows and columns covering a bounding box."""
+    if min_lat >= max_lat or min_lon >= max_lon:
+        raise HTTPException(status_code=400, detail="Invalid bounding box.")
+    if resolution < MIN_RESOLUTION:
+        raise HTTPException(status_code=400, detail=f"Resolution must be at least {MIN_RESOLUTION}.")
+
+    i0, i1 = _cell_index(min_lat, resolution), _cell_index(max_lat, resolution)
+    j0, j1 = _cell_index(min_lon, resolution), _cell_index(max_lon, resolution)
+    cells = (i1 - i0 + 1) * (j1 - j0 + 1)
+    if cells > max_cells:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grid too large: {cells} cells, at most {max_cells} allowed.",
+        )
+    return i0, i1, j0, j1
+
+def get_requirement_grid(
+        crop: Crop,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        resolution: float,
+        CEa: float,
+        EL: float,
+        texture: Texture,
+        CU: float,
+        Fr: float = 1,
+) -> tuple[np.ndarray, float, float]:
+    """Compute the irrigation requirement raster of a crop over a bounding box.
+
+    Returns:
+        tuple: The float32 raster of shape (len(GRID_BANDS), rows, cols), with
+        rows going south to north and columns west to east, and the latitude
+        and longitude of the center of its first cell.
+    """
+    i0, i1, j0, j1 = grid_cells(min_lat, min_lon, max_lat, max_lon, resolution)
+    rows, cols = i1 - i0 + 1, j1 - j0 + 1
+
+    signature = (
+        crop.user_id, crop.name, kc_signature(crop), crop.CEemax, crop.H, crop.f,
+        CEa, EL, texture, CU, Fr, resolution, date.today(),
+    )
+    tiles = [
+        (ti, tj)
+        for ti in range(i0 // TILE_SIZE, i1 // TILE_SIZE + 1)
+        for tj in range(j0 // TILE_SIZE, j1 // TILE_SIZE + 1)
+    ]
+
+    computed = {tile: tile_cache.get((signature, tile)) or _empty_tile() for tile in tiles}
+
+    # Requested cells not computed yet, in global indices, and their tiles.
+    missing_rows, missing_cols, missing_tiles = [], [], []
+    for (ti, tj), (_, done) in computed.items():
+        # Intersection of the tile with the requested cells, in tile indices.
+        r0, r1 = max(i0, ti * TILE_SIZE) - ti * TILE_SIZE, min(i1, (ti + 1) * TILE_SIZE - 1) - ti * TILE_SIZE
+        c0, c1 = max(j0, tj * TILE_SIZE) - tj * TILE_SIZE, min(j1, (tj + 1) * TILE_SIZE - 1) - tj * TILE_SIZE
+        rows_left, cols_left = np.nonzero(~done[r0:r1 + 1, c0:c1 + 1])
+        missing_rows.append(rows_left + r0 + ti * TILE_SIZE)
+        missing_cols.append(cols_left + c0 + tj * TILE_SIZE)
+        missing_tiles += [(ti, tj)] * len(rows_left)
+
+    # Fetch the weather of every missing cell in one bulk lookup.
+    if missing_tiles:
+        rows_left, cols_left = np.concatenate(missing_rows), np.concatenate(missing_cols)
+        coordinates = list(zip(
+            np.round((rows_left + 0.5) * resolution, 4).tolist(),
+            np.round((cols_left + 0.5) * resolution, 4).tolist(),
+        ))
+        payloads = get_weather_data_bulk(coordinates)
+        values = calculate_requirements(
+            crop=crop,
+            payloads=payloads,
+            timezones=[get_timezone(lat, lon) for lat, lon in coordinates],
+            CEa=CEa,
+            EL=EL,
+            texture=texture,
+            CU=CU,
+            Fr=Fr,
+        )
+
+        # Tiles are copied before they change, as cached ones may be read
+        # concurrently. Cells whose weather failed stay NaN and uncomputed,
+        # so they are retried by the next request rather than cached.
+        updated = {}
+        for k, (tile, payload) in enumerate(zip(missing_tiles, payloads)):
+            if payload is None:
+                continue
+            if tile not in updated:
+                updated[tile] = tuple(array.copy() for array in computed[tile])
+            tile_values, done = updated[tile]
+            r, c = rows_left[k] - tile[0] * TILE_SIZE, cols_left[k] - tile[1] * TILE_SIZE
+            tile_values[:, r, c] = values[:, k]
+            done[r, c] = True
+        for tile, entry in updated.items():
+            computed[tile] = tile_cache[(signature, tile)] = entry
+
+    grid = np.empty((len(GRID_BANDS), rows, cols), dtype=np.float32)
+    for (ti, tj), (tile, _) in computed.items():
+        # Intersection of the tile with the requested cells, in global indices.
+        r0, r1 = max(i0, ti * TILE_SIZE), min(i1, (ti + 1) * TILE_SIZE - 1)
+        c0, c1 = max(j0, tj * TILE_SIZE), min(j1, (tj + 1) * TILE_SIZE - 1)
+        grid[:, r0 - i0:r1 - i0 + 1, c0 - j0:c1 - j0 + 1] = tile[
+            :,
+            r0 - ti * TILE_SIZE:r1 - ti * TILE_SIZE + 1,
+            c0 - tj * TILE_SIZE:c1 - tj * TILE_SIZE + 1,
+        ]
+
+    origin_lat = round((i0 + 0.5) * resolution, 4)
+    origin_lon = round((j0 + 0.5) * resolution, 4)
+    return grid, origin_lat, origin_lon
+
+def serialize_grid(grid: np.ndarray, origin_lat: float, origin_lon: float, resolution: float) -> dict:
+    """JSON body of a requirement raster, one row-major matrix per band."""
+    # orjson writes the NaN of cells without weather as null.
+    rounded = np.round(grid.astype(np.float64), 2)
+    return {
+        "bands": GRID_BANDS,
+        "shape": grid.shape,
+        "origin": [origin_lat, origin_lon],
+        "resolution": resolution,
+        "values": dict(zip(GRID_BANDS, rounded)),
+    }
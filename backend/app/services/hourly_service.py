@@ -0,0 +1,114 @@
+from datetime import datetime, tzinfo
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.crop import Crop
+from app.models.field import Field
+from app.services.climate_service import (
+    HUMIDITY,
+    Climate,
+    WeatherPayload,
+    get_weather_data,
+    local_day_hours,
+)
+from app.services.crop_service import get_user_crop_by_name
+from app.services.kc_service import crop_Kc_window
+from app.services.timezone_service import get_timezone
+from app.services.irrigation_service import (
+    Texture,
+    calculate_crop_Dn,
+    calculate_deficit,
+    calculate_FL,
+    calculate_Pe_hourly,
+    calculate_RL,
+    calculate_Rt,
+)
+
+MAX_HOURLY_HOURS = 16 * 24
+
+def hour_isoformat(hour: int, tz: tzinfo) -> str:
+    """Local time of an hour since the epoch, with its UTC offset."""
+    return datetime.fromtimestamp(hour * 3600, tz).isoformat(timespec="minutes")
+
+def calculate_hourly_series(
+        field: Field,
+        crop: Crop,
+        payload: WeatherPayload,
+        tz: tzinfo,
+        start_hour: int,
+        hours: int,
+        deficit: float = 0,
+) -> dict:
+    """Hourly NRn, NRt and soil water deficit of a field over `hours` hours from `start_hour`.
+
+    Kc and effective precipitation depend on the local day, so the series
+    is computed over whole local days from the midnight before
+    `start_hour`, then cut. The deficit starts from `deficit` [mm] at
+    `start_hour`.
+    """
+    first_day = datetime.fromtimestamp(start_hour * 3600, tz).date()
+    # Local days are at least 23 hours long.
+    days = (hours + 24) // 23 + 1
+    bounds = local_day_hours(first_day.toordinal(), days, tz)
+    first_hour = int(bounds[0])
+    span = np.arange(first_hour, int(bounds[-1]))
+
+    et0, precipitation = payload.hourly_window(first_hour, len(span))
+    day = np.searchsorted(bounds, span, side="right") - 1
+    Kc = crop_Kc_window(crop, first_day, days)[day]
+    offset = start_hour - first_hour
+    NRn = (Kc * et0 - calculate_Pe_hourly(precipitation.astype(np.float64), day))[offset:offset + hours]
+
+    texture = Texture(field.texture)
+    climate = Climate.HUMID if payload.current[HUMIDITY] >= 50 else Climate.ARID
+    RL = calculate_RL(crop=crop, CEa=field.CEa)
+    FL = calculate_FL(EL=field.EL, RL=RL)
+    Ea = calculate_Rt(crop=crop, climate=climate, texture=texture) * field.CU * FL
+    Dn = calculate_crop_Dn(crop=crop, texture=texture)
+
+    return {
+        "Dn": Dn,
+        "Ea": Ea,
+        "NRn": NRn,
+        "NRt": NRn / Ea,
+        "deficit": calculate_deficit(NRn, initial=deficit),
+    }
+
+def get_field_hourly(db: Session, field: Field, hours: int, deficit: float = 0) -> dict:
+    """Hourly irrigation series of a field from the current hour.
+
+    `due` is the first hour at which the deficit reaches the net dose Dn,
+    None if it does not within the series.
+    """
+    if not 1 <= hours <= MAX_HOURLY_HOURS:
+        raise HTTPException(status_code=400, detail=f"Between 1 and {MAX_HOURLY_HOURS} hours can be requested.")
+
+    crop = get_user_crop_by_name(crop_name=field.crop_name, db=db, user_id=field.user_id)
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{field.crop_name}' not found.")
+    try:
+        payload = get_weather_data(field.lat, field.lon)
+    except ValueError:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
+
+    tz = get_timezone(field.lat, field.lon)
+    start_hour = payload.current_hour
+    series = calculate_hourly_series(field, crop, payload, tz, start_hour, hours, deficit)
+    reached = np.flatnonzero(series["deficit"] >= series["Dn"])
+    due: Optional[str] = hour_isoformat(start_hour + int(reached[0]), tz) if len(reached) else None
+
+    # Hours without forecast are null.
+    return {
+        "field": field.id,
+        "start": hour_isoformat(start_hour, tz),
+        "hours": hours,
+        "Dn": round(series["Dn"], 2),
+        "Ea": round(series["Ea"], 4),
+        "due": due,
+        "NRn": np.round(series["NRn"], 3),
+        "NRt": np.round(series["NRt"], 3),
+        "deficit": np.round(series["deficit"], 3),
+    }
@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.upsert import dialect_insert
+from app.models.field import Field
+from app.models.irrigation_event import IrrigationAggregate, IrrigationEvent
+from app.schemas.irrigation_event import SummaryGroup
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+def create_event(
+        db: Session,
+        field: Field,
+        applied: float,
+        recommended: float,
+        applied_at: Optional[datetime] = None,
+):
+    """Record an irrigation event and fold it into the weekly aggregates.
+
+    Both writes happen in the same transaction, so the aggregates always
+    match the raw events.
+    """
+    applied_at = applied_at or datetime.utcnow()
+    event = IrrigationEvent(
+        user_id=field.user_id,
+        field_id=field.id,
+        crop_name=field.crop_name,
+        applied_at=applied_at,
+        applied=applied,
+        recommended=recommended,
+    )
+    db.add(event)
+
+    table = IrrigationAggregate.__table__
+    stmt = dialect_insert(db.get_bind(), table).values(
+        user_id=field.user_id,
+        field_id=field.id,
+        crop_name=field.crop_name,
+        week=week_start(applied_at.date()),
+        events=1,
+        applied=applied,
+        recommended=recommended,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key.columns],
+        set_={
+            "events": table.c.events + stmt.excluded.events,
+            "applied": table.c.applied + stmt.excluded.applied,
+            "recommended": table.c.recommended + stmt.excluded.recommended,
+        },
+    ))
+
+    db.commit()
+    db.refresh(event)
+    return event
+
+def list_events(
+        db: Session,
+        user_id: int,
+        field_id: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: int = 50,
+) -> tuple[list[IrrigationEvent], Optional[int]]:
+    """Return a page of events, newest first, and the cursor of the next page."""
+    query = db.query(IrrigationEvent).filter(IrrigationEvent.user_id == user_id)
+    if field_id is not None:
+        query = query.filter(IrrigationEvent.field_id == field_id)
+    if before is not None:
+        query = query.filter(IrrigationEvent.id < before)
+
+    # One extra row tells whether there is a next page.
+    events = query.order_by(IrrigationEvent.id.desc()).limit(limit + 1).all()
+    if len(events) > limit:
+        return events[:limit], events[limit - 1].id
+    return events, None
+
+def summarize_events(
+        db: Session,
+        user_id: int,
+        group_by: SummaryGroup,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+):
+    """Applied vs recommended water, read from the weekly aggregates."""
+    key = {
+        SummaryGroup.FIELD: IrrigationAggregate.field_id,
+        SummaryGroup.CROP: IrrigationAggregate.crop_name,
+        SummaryGroup.WEEK: IrrigationAggregate.week,
+    }[group_by]
+
+    query = db.query(
+        key,
+        func.sum(IrrigationAggregate.events),
+        func.sum(IrrigationAggregate.applied),
+        func.sum(IrrigationAggregate.recommended),
+    ).filter(IrrigationAggregate.user_id == user_id)
+    if start is not None:
+        query = query.filter(IrrigationAggregate.week >= week_start(start))
+    if end is not None:
+        query = query.filter(IrrigationAggregate.week <= end)
+
+    return query.group_by(key).order_by(key).all()
@@ -1,8 +1,20 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.models.crop import Crop
+from app.models.field import Field
 from enum import Enum
-from app.services.climate_service import get_climate, Climate
+from types import SimpleNamespace
+import numpy as np
+from app.services.climate_service import (
+    Climate,
+    climate_from_payload,
+    get_climate,
+    get_weather_data_bulk,
+)
+from app.services.timezone_service import get_timezone
+from app.services.kc_service import crop_Kc
+from datetime import date
+from typing import Optional
 
 class Texture(str, Enum):
     HEAVY = "HEAVY"
@@ -83,6 +95,26 @@ def calculate_Rt(crop: Crop, climate: Climate, texture: Texture) -> float:
             },
         }[climate][texture]
 
+# Axis order of the arrays returned by `calculate_Rt_table`.
+RT_CLIMATES = (Climate.ARID, Climate.HUMID)
+RT_TEXTURES = tuple(Texture)
+
+def calculate_Rt_table(crop: Crop) -> np.ndarray:
+    """Tabulate `calculate_Rt` for a crop over every climate and texture.
+
+    Returns:
+        np.ndarray: Rt values of shape (len(RT_CLIMATES), len(RT_TEXTURES)),
+        meant to be indexed with climate/texture index arrays.
+    """
+    height = SimpleNamespace(H=crop.H)
+    return np.array(
+        [
+            [calculate_Rt(crop=height, climate=climate, texture=texture) for texture in RT_TEXTURES]
+            for climate in RT_CLIMATES
+        ],
+        dtype=np.float32,
+    )
+
 def calculate_Dn(db: Session, crop_name: str, texture: Texture) -> float:
     """Calculer la Dose nette d’arrosage (Dn).
 
@@ -102,6 +134,10 @@ def calculate_Dn(db: Session, crop_name: str, texture: Texture) -> float:
     if not crop:
         raise HTTPException(status_code=404, detail=f"Crop '{crop_name}' not found.")
 
+    return calculate_crop_Dn(crop=crop, texture=texture)
+
+def calculate_crop_Dn(crop: Crop, texture: Texture) -> float:
+    """Calculer la Dose nette d’arrosage (Dn) d'une culture déjà chargée."""
     props = SOIL_PROPERTIES.get(texture)
     if not props:
         raise HTTPException(status_code=400, detail="Invalid soil texture.")
@@ -111,6 +147,27 @@ def calculate_Dn(db: Session, crop_name: str, texture: Texture) -> float:
 
     return crop.H * (Cc - Pm) * crop.f
 
+def calculate_depletion(crop: Crop, texture: Texture, moisture: float) -> float:
+    """Calculer le déficit hydrique mesuré du sol.
+
+    Args:
+        crop (Crop): The crop, with its Kc, CEemax, height (H), and f values.
+        texture (Texture): The soil texture.
+        moisture (float): Humidité mesurée du sol (mm/cm).
+
+    Returns:
+        float: La quantité d'eau (mm) à apporter pour ramener le sol à la
+        capacité au champ, bornée par la réserve utile.
+    """
+    props = SOIL_PROPERTIES.get(texture)
+    if not props:
+        raise HTTPException(status_code=400, detail="Invalid soil texture.")
+
+    Cc = props["Cc"]
+    Pm = props["Pm"]
+
+    return crop.H * (Cc - min(max(moisture, Pm), Cc))
+
 def calculate_RL(crop: Crop, CEa: float) -> float:
     """Calculer la Relation de Lavage (RL).
 
@@ -164,18 +221,19 @@ def calculate_Ea(
 
     return Ea , Rt, RL, FL
 
-def calculate_ETc(crop: Crop, ET0: float) -> float:
+def calculate_ETc(crop: Crop, ET0: float, day: Optional[date] = None) -> float:
     """Calculate Evapotranspiration XYZ
     Args:
         crop (Crop): The crop, with its Kc, CEemax, height (H), and f values.
         ET0 (float): Évapotranspiration de référence [mm/mois] ou [mm/jour]
+        day (date): The day, for crops with growth stages; today by default.
     Returns:
         float: Évapotranspiration (ETc)
 
     Raises:
         HTTPException: If the crop does not exist in the database.
     """
-    return crop.Kc * ET0
+    return crop_Kc(crop, day) * ET0
 
 def calculate_Pe(P: float) -> float:
     """ Calcualte Monthly Recorded Precipitation
@@ -186,6 +244,38 @@ def calculate_Pe(P: float) -> float:
     """
     return 0.8 * P - 25 if P > 75 else 0.6 * P - 10
 
+def calculate_Pe_array(P: np.ndarray) -> np.ndarray:
+    """Vectorized `calculate_Pe` over an array of precipitations."""
+    return np.where(P > 75, 0.8 * P - 25, 0.6 * P - 10)
+
+def calculate_Pe_hourly(P: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Effective part of hourly precipitations.
+
+    `calculate_Pe` is applied to the total of each day, and spread over the
+    hours of the day in proportion to their precipitation. Days whose
+    effective precipitation would be negative count as dry.
+
+    Args:
+        P (np.ndarray): Hourly precipitations [mm].
+        day (np.ndarray): Index of the day of each hour, from 0.
+    """
+    totals = np.bincount(day, weights=P)
+    Pe = np.maximum(calculate_Pe_array(totals), 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(totals > 0, Pe / totals, 0)
+    return P * ratio[day]
+
+def calculate_deficit(NRn: np.ndarray, initial: float = 0) -> np.ndarray:
+    """Soil water deficit after each step of a series of net requirements [mm].
+
+    The deficit grows by NRn at each step and never goes below 0, as water
+    beyond field capacity drains. With S the running sum of NRn from the
+    initial deficit, the deficit is `S - min(0, min(S[:t+1]))`, so the
+    series is computed without a loop over its steps.
+    """
+    S = initial + np.cumsum(NRn)
+    return S - np.minimum(np.minimum.accumulate(S), 0)
+
 def calculate_NRn(db: Session, crop_name: str, lat: float, lon: float) -> tuple[float, float, float]:
     """Calculate  Calculate Net Water Requirements
     Args:
@@ -204,7 +294,7 @@ def calculate_NRn(db: Session, crop_name: str, lat: float, lon: float) -> tuple[
     climate_data = get_climate(lat, lon)
     ET0, P = climate_data["ET0"], climate_data["precipitation"]
 
-    ETc = calculate_ETc(crop=crop, ET0=ET0)
+    ETc = calculate_ETc(crop=crop, ET0=ET0, day=date.fromisoformat(climate_data["date"]))
     Pe = calculate_Pe(P)
 
     NRn = ETc - Pe
@@ -225,3 +315,151 @@ def calculate_NRt(NRn: float, Ea: float) -> float:
 
 def calculate_I(NRn: float,  Dn: float) -> float:
     return NRn / Dn
+
+MAX_SWEEP_COMBINATIONS = 100_000
+
+def calculate_NRt_sweep(
+        db: Session,
+        crop_name: str,
+        lat: float,
+        lon: float,
+        CEa: np.ndarray,
+        EL: np.ndarray,
+        CU: np.ndarray,
+        Fr: np.ndarray,
+        textures: list[Texture],
+) -> tuple[float, np.ndarray, np.ndarray]:
+    """Evaluate NRt over the Cartesian product of the field settings.
+
+    The crop and the climate are looked up once; RL, FL, Rt and Ea are then
+    computed in a single broadcast pass.
+
+    Args:
+        db (Session): La session de base de données pour interroger les données de la culture.
+        crop_name (str): Le nom de la culture pour récupérer les données correspondantes.
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+        CEa (np.ndarray): Conductivités électriques de l'eau d’arrosage en [dS/m].
+        EL (np.ndarray): Efficacités de lavage.
+        CU (np.ndarray): Coefficients d'uniformité.
+        Fr (np.ndarray): Facteurs de réduction.
+        textures (list[Texture]): Soil textures.
+
+    Returns:
+        tuple: NRn, and the Ea and NRt arrays of shape
+        (len(CEa), len(EL), len(CU), len(Fr), len(textures)).
+    """
+    crop = db.query(Crop).filter(Crop.name == crop_name).first()
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{crop_name}' not found.")
+
+    climate_data = get_climate(lat, lon)
+    if not climate_data or climate_data["ET0"] is None:
+        raise HTTPException(status_code=502, detail="Could not retrieve climate data")
+
+    ETc = calculate_ETc(crop=crop, ET0=climate_data["ET0"], day=date.fromisoformat(climate_data["date"]))
+    NRn = ETc - calculate_Pe(climate_data["precipitation"])
+
+    RL = calculate_RL(crop=crop, CEa=CEa[:, None, None, None, None])
+    FL = calculate_FL(EL=EL[None, :, None, None, None], RL=RL)
+    Rt = calculate_Rt_table(crop)[
+        RT_CLIMATES.index(climate_data["climate"]),
+        [RT_TEXTURES.index(texture) for texture in textures],
+    ]
+    Ea = Rt * CU[None, None, :, None, None] * Fr[None, None, None, :, None] * FL
+
+    return NRn, Ea, calculate_NRt(NRn=NRn, Ea=Ea)
+
+def calculate_crop_metrics(
+        crop: Crop,
+        climate_data: dict,
+        CEa: float,
+        EL: float,
+        texture: Texture,
+        CU: float,
+        Fr: float = 1,
+) -> dict:
+    """Calculate every irrigation metric of a crop from a climate snapshot.
+
+    Unlike the `calculate_*` functions taking a crop name, nothing is queried,
+    so the crops and the climate can be loaded once for many crops.
+
+    Args:
+        crop (Crop): The crop, with its Kc, CEemax, height (H), and f values.
+        climate_data (dict): The climate, as returned by `get_climate`.
+        CEa (float): Conductivité électrique de l'eau d’arrosage en [dS/m].
+        EL (float): L’efficacité de lavage.
+        texture (Texture): The soil texture.
+        CU (float): Coefficient d'uniformité.
+        Fr (float): Facteur de réduction.
+
+    Returns:
+        dict: NRn, Pe, ETc, Ea, Rt, RL, FL, NRt, Dn, Dt and I.
+    """
+    ETc = calculate_ETc(crop=crop, ET0=climate_data["ET0"], day=date.fromisoformat(climate_data["date"]))
+    Pe = calculate_Pe(climate_data["precipitation"])
+    NRn = ETc - Pe
+
+    RL = calculate_RL(crop=crop, CEa=CEa)
+    FL = calculate_FL(EL=EL, RL=RL)
+    Rt = calculate_Rt(crop=crop, climate=climate_data["climate"], texture=texture)
+    Ea = Rt * CU * Fr * FL
+
+    Dn = calculate_crop_Dn(crop=crop, texture=texture)
+
+    return {
+        "NRn": NRn,
+        "Pe": Pe,
+        "ETc": ETc,
+        "Ea": Ea,
+        "Rt": Rt,
+        "RL": RL,
+        "FL": FL,
+        "NRt": calculate_NRt(NRn=NRn, Ea=Ea),
+        "Dn": Dn,
+        "Dt": Dn / Ea,
+        "I": calculate_I(NRn, Dn),
+    }
+
+def calculate_fields_metrics(db: Session, fields: list[Field]) -> dict[int, Optional[dict]]:
+    """Every irrigation metric of many fields, None where it cannot be computed.
+
+    Crops are loaded in one query and the weather in one bulk lookup, so
+    fields sharing a location share its payload.
+
+    Returns:
+        dict: By field id, the metrics of `calculate_crop_metrics` and the
+        date they are computed for.
+    """
+    user_ids = {field.user_id for field in fields}
+    crops = {
+        (crop.user_id, crop.name): crop
+        for crop in db.query(Crop).filter(Crop.user_id.in_(user_ids))
+    }
+    cells = list(dict.fromkeys((field.lat, field.lon) for field in fields))
+    payloads = dict(zip(cells, get_weather_data_bulk(cells)))
+
+    metrics = {}
+    for field in fields:
+        crop = crops.get((field.user_id, field.crop_name))
+        payload = payloads[(field.lat, field.lon)]
+        if crop is None or payload is None:
+            metrics[field.id] = None
+            continue
+
+        climate_data = climate_from_payload(payload, get_timezone(field.lat, field.lon))
+        if climate_data["ET0"] is None:
+            metrics[field.id] = None
+            continue
+        metrics[field.id] = {
+            "date": climate_data["date"],
+            **calculate_crop_metrics(
+                crop=crop,
+                climate_data=climate_data,
+                CEa=field.CEa,
+                EL=field.EL,
+                texture=Texture(field.texture),
+                CU=field.CU,
+            ),
+        }
+    return metrics
@@ -0,0 +1,322 @@
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Optional
+
+import numpy as np
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.crop import Crop
+from app.models.job import Job
+from app.schemas.irrigation import GridInput, SweepInput
+from app.services.grid_service import (
+    MAX_GRID_CELLS,
+    TILE_SIZE,
+    get_requirement_grid,
+    grid_cells,
+    serialize_grid,
+)
+from app.services.quota_service import Priority, upstream_budget, upstream_priority
+from app.services.sweep_service import run_sweep, sweep_shape
+
+# Background grids are computed in strips of at most MAX_GRID_CELLS cells.
+MAX_JOB_GRID_CELLS = 1_000_000
+# Niceness of the job workers, so API requests keep priority on the CPU.
+WORKER_NICENESS = 10
+
+class JobKind(str, Enum):
+    GRID = "grid"
+    SWEEP = "sweep"
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    pass
+
+class JobContext:
+    """Handle given to a running job to report its progress.
+
+    Reporting progress is also where cancellation is noticed: once the job
+    is no longer running, `progress` raises JobCancelled.
+    """
+
+    def __init__(self, db: Session, job_id: str):
+        self.db = db
+        self.job_id = job_id
+
+    def progress(self, fraction: float):
+        updated = self.db.execute(
+            update(Job)
+            .where(Job.id == self.job_id, Job.status == JobStatus.RUNNING)
+            .values(progress=round(fraction, 4))
+        ).rowcount
+        self.db.commit()
+        if not updated:
+            raise JobCancelled()
+
+def _grid_strips(data: GridInput) -> list[tuple[int, int]]:
+    """First and last rows of the strips a background grid is computed in."""
+    i0, i1, j0, j1 = grid_cells(
+        data.min_lat, data.min_lon, data.max_lat, data.max_lon, data.resolution,
+        max_cells=MAX_JOB_GRID_CELLS,
+    )
+    cols = j1 - j0 + 1
+    if cols > MAX_GRID_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grid too wide: {cols} columns, at most {MAX_GRID_CELLS} allowed.",
+        )
+
+    # Strips span whole tiles where possible, so they share no tile.
+    step = MAX_GRID_CELLS // cols
+    if step >= TILE_SIZE:
+        step -= step % TILE_SIZE
+
+    strips = []
+    r0 = i0
+    while r0 <= i1:
+        r1 = min(i1, (r0 // step + 1) * step - 1)
+        strips.append((r0, r1))
+        r0 = r1 + 1
+    return strips
+
+def run_grid_job(ctx: JobContext, params: dict) -> dict:
+    data = GridInput(**params)
+    crop = ctx.db.query(Crop).filter(Crop.name == data.crop_name).first()
+    if not crop:
+        raise HTTPException(status_code=404, detail=f"Crop '{data.crop_name}' not found.")
+
+    strips = _grid_strips(data)
+    grids = []
+    origin = None
+    for k, (r0, r1) in enumerate(strips):
+        # From the lower edge of the first row to the center of the last, so
+        # a one-row strip still spans a valid box and no neighbour row is
+        # included.
+        grid, origin_lat, origin_lon = get_requirement_grid(
+            crop=crop,
+            min_lat=r0 * data.resolution,
+            min_lon=data.min_lon,
+            max_lat=(r1 + 0.5) * data.resolution,
+            max_lon=data.max_lon,
+            resolution=data.resolution,
+            CEa=data.CEa,
+            EL=data.EL,
+            texture=data.texture,
+            CU=data.CU,
+        )
+        grids.append(grid)
+        origin = origin or (origin_lat, origin_lon)
+        ctx.progress((k + 1) / len(strips))
+
+    return serialize_grid(np.concatenate(grids, axis=1), *origin, data.resolution)
+
+def run_sweep_job(ctx: JobContext, params: dict) -> dict:
+    return run_sweep(db=ctx.db, data=SweepInput(**params))
+
+JOB_FUNCTIONS: dict[JobKind, Callable[[JobContext, dict], dict]] = {
+    JobKind.GRID: run_grid_job,
+    JobKind.SWEEP: run_sweep_job,
+}
+
+def _finish(db: Session, job_id: str, status: JobStatus, **values):
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+        .values(status=status, finished_at=datetime.utcnow(), **values)
+    )
+    db.commit()
+
+def execute_job(job_id: str):
+    """Run a pending job, in a worker process."""
+    db = SessionLocal()
+    try:
+        # Claiming the job fails if it was cancelled while queued.
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+            .values(status=JobStatus.RUNNING, progress=0, started_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+
+        job = db.get(Job, job_id)
+        try:
+            with upstream_priority(Priority.BATCH):
+                result = JOB_FUNCTIONS[JobKind(job.kind)](JobContext(db, job_id), job.params)
+        except JobCancelled:
+            return
+        except HTTPException as e:
+            db.rollback()
+            _finish(db, job_id, JobStatus.FAILED, error=str(e.detail))
+        except Exception as e:
+            db.rollback()
+            _finish(db, job_id, JobStatus.FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            _finish(
+                db,
+                job_id,
+                JobStatus.SUCCEEDED,
+                progress=1,
+                result=orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY),
+            )
+    finally:
+        db.close()
+
+def _init_worker(max_workers: int):
+    os.nice(WORKER_NICENESS)
+    # Workers split the share of the weather API quotas left to jobs.
+    upstream_budget.set_share(settings.UPSTREAM_JOB_SHARE / max_workers)
+
+class JobRunner:
+    """Runs jobs on a bounded pool of worker processes, created on first use.
+
+    Workers are spawned rather than forked, as the API process runs
+    threads, and they get a lower CPU priority than the API.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.max_workers,),
+            )
+        return self._pool
+
+    def submit(self, job_id: str):
+        with self._lock:
+            pool = self._get_pool()
+            future = pool.submit(execute_job, job_id)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda future: self._done(job_id, pool, future))
+
+    def cancel(self, job_id: str):
+        """Drop a queued job from the pool; running jobs stop on their next progress report."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+
+    def _done(self, job_id: str, pool: ProcessPoolExecutor, future: Future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled() or future.exception() is None:
+            return
+
+        # A worker died, e.g. killed for running out of memory, which breaks
+        # the pool: the jobs it was running fail and the queued ones move to
+        # a new pool.
+        exception = future.exception()
+        db = SessionLocal()
+        try:
+            _finish(db, job_id, JobStatus.FAILED, error=f"Worker failed: {exception!r}")
+            status = db.get(Job, job_id).status
+        finally:
+            db.close()
+
+        if isinstance(exception, BrokenProcessPool):
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            if status == JobStatus.PENDING:
+                self.submit(job_id)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+job_runner = JobRunner(max_workers=settings.JOB_WORKERS)
+
+def resume_jobs():
+    """Requeue the jobs left pending or interrupted by a restart."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Job)
+            .where(Job.status == JobStatus.RUNNING)
+            .values(status=JobStatus.PENDING, progress=0, started_at=None)
+        )
+        db.commit()
+        job_ids = db.query(Job.id).filter(Job.status == JobStatus.PENDING).order_by(Job.created_at).all()
+    finally:
+        db.close()
+    for (job_id,) in job_ids:
+        job_runner.submit(job_id)
+
+def create_job(db: Session, user_id: int, kind: JobKind, params: dict) -> Job:
+    # Invalid requests are rejected now rather than failing in the background.
+    if kind == JobKind.GRID:
+        _grid_strips(GridInput(**params))
+    elif kind == JobKind.SWEEP:
+        sweep_shape(SweepInput(**params))
+
+    job = Job(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        kind=kind,
+        params=params,
+        status=JobStatus.PENDING,
+        progress=0,
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    job_runner.submit(job.id)
+    return job
+
+def get_user_jobs(db: Session, user_id: int, limit: int = 50):
+    return (
+        db.query(Job)
+        .filter(Job.user_id == user_id)
+        .order_by(Job.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+def get_user_job(db: Session, user_id: int, job_id: str) -> Job:
+    job = db.query(Job).filter(Job.user_id == user_id, Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def cancel_job(db: Session, job: Job) -> Job:
+    cancelled = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))
+        .values(status=JobStatus.CANCELLED, finished_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    db.refresh(job)
+    if not cancelled:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+
+    job_runner.cancel(job.id)
+    return job
@@ -0,0 +1,61 @@
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from app.models.crop import Crop, CropStages
+
+# Daily Kc tables, by curve. Crops sharing a curve share its table.
+kc_table_cache = LRUCache(maxsize=1024)
+
+def _curve(stages: CropStages) -> tuple:
+    return (
+        stages.Kc_ini, stages.Kc_mid, stages.Kc_end,
+        stages.L_ini, stages.L_dev, stages.L_mid, stages.L_late,
+    )
+
+def build_kc_table(stages: CropStages) -> np.ndarray:
+    """Daily Kc of the FAO-56 stage curve, indexed by days since planting.
+
+    Kc is Kc_ini during the initial stage, rises linearly to Kc_mid over the
+    development stage, stays at Kc_mid during mid-season and falls linearly
+    to Kc_end over the late season.
+    """
+    return np.concatenate([
+        np.full(stages.L_ini, stages.Kc_ini),
+        stages.Kc_ini + (stages.Kc_mid - stages.Kc_ini) * np.arange(1, stages.L_dev + 1) / stages.L_dev,
+        np.full(stages.L_mid, stages.Kc_mid),
+        stages.Kc_mid + (stages.Kc_end - stages.Kc_mid) * np.arange(1, stages.L_late + 1) / stages.L_late,
+    ]).astype(np.float32)
+
+def get_kc_table(stages: CropStages) -> np.ndarray:
+    key = _curve(stages)
+    table = kc_table_cache.get(key)
+    if table is None:
+        table = kc_table_cache[key] = build_kc_table(stages)
+        table.flags.writeable = False
+    return table
+
+def crop_Kc_window(crop: Crop, start: date, days: int) -> np.ndarray:
+    """Kc of a crop on each of `days` days from `start`.
+
+    Days before planting use Kc_ini and days after the season Kc_end.
+    """
+    if crop.stages is None:
+        return np.full(days, crop.Kc, dtype=np.float32)
+    table = get_kc_table(crop.stages)
+    offset = (start - crop.stages.planting_date).days
+    return table[np.clip(np.arange(offset, offset + days), 0, len(table) - 1)]
+
+def crop_Kc(crop: Crop, day: Optional[date] = None) -> float:
+    """Kc of a crop on a day, today by default."""
+    if crop.stages is None:
+        return crop.Kc
+    return float(crop_Kc_window(crop, day or date.today(), 1)[0])
+
+def kc_signature(crop: Crop) -> tuple:
+    """Everything the Kc of a crop depends on, for cache keys and ETags."""
+    if crop.stages is None:
+        return (crop.Kc,)
+    return (crop.Kc, crop.stages.planting_date.toordinal(), *_curve(crop.stages))
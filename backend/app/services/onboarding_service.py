@@ -0,0 +1,130 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.crop import Crop
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.crop_service import default_crops
+from app.utils.hashing import hash_password
+
+ROLES = ("admin", "moderator", "user")
+CHUNK_SIZE = 500
+
+_hashing_pool: Optional[ProcessPoolExecutor] = None
+
+def get_hashing_pool() -> ProcessPoolExecutor:
+    """Process pool hashing passwords on every core, created on first use.
+
+    Workers are spawned, as forking the threaded server process could copy
+    locks held by other threads.
+    """
+    global _hashing_pool
+    if _hashing_pool is None:
+        _hashing_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hashing_pool
+
+def read_users_csv(lines: Iterable[str]) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Parse a CSV of users with `email`, `password` and optional `role` columns.
+
+    Yields:
+        tuple: The line number, and either the user or the reason it is invalid.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            user = UserCreate(email=(row.get("email") or "").strip(), password=row.get("password") or "")
+        except ValidationError as e:
+            yield reader.line_num, None, e.errors()[0]["msg"]
+            continue
+        role = (row.get("role") or "user").strip()
+        if role not in ROLES:
+            yield reader.line_num, None, f"Invalid role '{role}'"
+            continue
+        if not user.password:
+            yield reader.line_num, None, "Missing password"
+            continue
+        yield reader.line_num, {"email": user.email, "password": user.password, "role": role}, None
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def onboard_users(
+        db: Session,
+        lines: Iterable[str],
+        with_crops: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Create users from a CSV stream in bulk.
+
+    Rows are processed `chunk_size` at a time: passwords are hashed on the
+    process pool, then the users, and optionally their default crops, are
+    inserted with one statement each and committed together.
+
+    Returns:
+        dict: The number of created and skipped users, and the invalid rows.
+    """
+    created = 0
+    skipped = 0
+    errors = []
+    seen: set[str] = set()
+
+    for chunk in _chunks(read_users_csv(lines), chunk_size):
+        users = []
+        for line, user, error in chunk:
+            if error:
+                errors.append({"line": line, "detail": error})
+            elif user["email"] in seen:
+                skipped += 1
+            else:
+                seen.add(user["email"])
+                users.append(user)
+
+        existing = set(db.scalars(
+            select(User.email).where(User.email.in_([user["email"] for user in users]))
+        ))
+        users = [user for user in users if user["email"] not in existing]
+        skipped += len(existing)
+        if not users:
+            continue
+
+        hashes = get_hashing_pool().map(
+            hash_password,
+            [user["password"] for user in users],
+            chunksize=max(1, len(users) // (os.cpu_count() or 1)),
+        )
+        db.execute(insert(User), [
+            {"email": user["email"], "hashed_password": hashed, "role": user["role"]}
+            for user, hashed in zip(users, hashes)
+        ])
+
+        if with_crops:
+            user_ids = db.scalars(
+                select(User.id).where(User.email.in_([user["email"] for user in users]))
+            ).all()
+            db.execute(insert(Crop), [
+                {"user_id": user_id, **crop.model_dump()}
+                for user_id in user_ids
+                for crop in default_crops
+            ])
+
+        db.commit()
+        created += len(users)
+
+    return {"created": created, "skipped": skipped, "errors": errors}
@@ -0,0 +1,203 @@
+from enum import Enum
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.models.field import Field
+from app.models.organization import (
+    DemandRollup,
+    Farm,
+    FarmField,
+    FieldDemand,
+    Organization,
+    OrganizationMember,
+)
+from app.models.user import User
+from app.services.demand_service import RollupLevel, get_rollup, update_field_demands
+
+class MemberRole(str, Enum):
+    MANAGER = "manager"
+    MEMBER = "member"
+
+def create_organization(db: Session, name: str, user_id: int) -> Organization:
+    organization = Organization(name=name)
+    db.add(organization)
+    db.flush()
+    db.add(OrganizationMember(
+        organization_id=organization.id,
+        user_id=user_id,
+        role=MemberRole.MANAGER,
+        accepted=True,
+    ))
+    get_rollup(db, RollupLevel.ORGANIZATION, organization.id)
+    db.commit()
+    db.refresh(organization)
+    return organization
+
+def get_user_organizations(db: Session, user_id: int):
+    return (
+        db.query(Organization)
+        .join(OrganizationMember, OrganizationMember.organization_id == Organization.id)
+        .filter(OrganizationMember.user_id == user_id, OrganizationMember.accepted)
+        .order_by(Organization.id)
+        .all()
+    )
+
+def get_user_invitations(db: Session, user_id: int):
+    """Organizations the user is invited to and has not answered yet."""
+    return (
+        db.query(Organization)
+        .join(OrganizationMember, OrganizationMember.organization_id == Organization.id)
+        .filter(OrganizationMember.user_id == user_id, ~OrganizationMember.accepted)
+        .order_by(Organization.id)
+        .all()
+    )
+
+def get_membership(
+        db: Session,
+        organization_id: int,
+        user_id: int,
+        role: Optional[MemberRole] = None,
+) -> OrganizationMember:
+    """The accepted membership of a user, checking they have `role` if given."""
+    member = db.get(OrganizationMember, (organization_id, user_id))
+    if member is None or not member.accepted:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if role is not None and member.role != role:
+        raise HTTPException(status_code=403, detail=f"Only a {role.value} of the organization can do this.")
+    return member
+
+def get_organization_members(db: Session, organization_id: int):
+    return (
+        db.query(OrganizationMember)
+        .filter(OrganizationMember.organization_id == organization_id)
+        .order_by(OrganizationMember.user_id)
+        .all()
+    )
+
+def set_organization_member(db: Session, organization_id: int, user_id: int, role: MemberRole) -> OrganizationMember:
+    """Change the role of a member, or invite a user who is not one yet.
+
+    Invited users are not members until they accept, see `accept_invitation`.
+    """
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    member = db.get(OrganizationMember, (organization_id, user_id))
+    if member is None:
+        member = OrganizationMember(organization_id=organization_id, user_id=user_id, accepted=False)
+        db.add(member)
+    member.role = role
+    db.commit()
+    db.refresh(member)
+    return member
+
+def accept_invitation(db: Session, organization_id: int, user_id: int) -> OrganizationMember:
+    member = db.get(OrganizationMember, (organization_id, user_id))
+    if member is None or member.accepted:
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    member.accepted = True
+    db.commit()
+    db.refresh(member)
+    return member
+
+def decline_invitation(db: Session, organization_id: int, user_id: int):
+    removed = db.query(OrganizationMember).filter(
+        OrganizationMember.organization_id == organization_id,
+        OrganizationMember.user_id == user_id,
+        ~OrganizationMember.accepted,
+    ).delete()
+    if not removed:
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    db.commit()
+
+def remove_organization_member(db: Session, organization_id: int, user_id: int):
+    member = db.get(OrganizationMember, (organization_id, user_id))
+    if member is None:
+        raise HTTPException(status_code=404, detail="Member not found")
+    farms = db.query(Farm.id).filter(Farm.organization_id == organization_id, Farm.user_id == user_id).count()
+    if farms:
+        raise HTTPException(status_code=409, detail=f"The member still owns {farms} farm(s).")
+    db.delete(member)
+    db.commit()
+
+def get_organization_farms(db: Session, organization_id: int, user_id: Optional[int] = None):
+    """Farms of an organization, only those of `user_id` if given."""
+    query = db.query(Farm).filter(Farm.organization_id == organization_id)
+    if user_id is not None:
+        query = query.filter(Farm.user_id == user_id)
+    return query.order_by(Farm.id).all()
+
+def get_organization_farm(db: Session, member: OrganizationMember, farm_id: int) -> Farm:
+    """A farm of the member's organization, which they own or manage."""
+    farm = db.query(Farm).filter(
+        Farm.organization_id == member.organization_id,
+        Farm.id == farm_id,
+    ).first()
+    if not farm or (member.role != MemberRole.MANAGER and farm.user_id != member.user_id):
+        raise HTTPException(status_code=404, detail="Farm not found")
+    return farm
+
+def create_farm(db: Session, member: OrganizationMember, name: str, user_id: Optional[int] = None) -> Farm:
+    """Create a farm owned by the member, or by `user_id` if the member is a manager.
+
+    The owner must have accepted their membership.
+    """
+    user_id = user_id if user_id is not None else member.user_id
+    if user_id != member.user_id:
+        get_membership(db, member.organization_id, member.user_id, role=MemberRole.MANAGER)
+        owner = db.get(OrganizationMember, (member.organization_id, user_id))
+        if owner is None or not owner.accepted:
+            raise HTTPException(status_code=400, detail="The owner of a farm must be a member of its organization.")
+
+    farm = Farm(organization_id=member.organization_id, user_id=user_id, name=name)
+    db.add(farm)
+    db.flush()
+    get_rollup(db, RollupLevel.FARM, farm.id)
+    db.commit()
+    db.refresh(farm)
+    return farm
+
+def delete_farm(db: Session, farm: Farm):
+    field_ids = [field_id for (field_id,) in db.query(FarmField.field_id).filter(FarmField.farm_id == farm.id)]
+    db.query(FarmField).filter(FarmField.farm_id == farm.id).delete()
+    db.flush()
+    update_field_demands(db, field_ids)
+
+    db.query(DemandRollup).filter(
+        DemandRollup.level == RollupLevel.FARM,
+        DemandRollup.entity_id == farm.id,
+    ).delete()
+    db.delete(farm)
+    db.commit()
+
+def add_farm_field(db: Session, farm: Farm, field_id: int, user_id: int) -> FieldDemand:
+    """Move a field of the farm's owner into the farm, counting its demand in the rollups.
+
+    Only the owner, `user_id`, may attach their fields; managers cannot.
+    """
+    if farm.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Only the owner of a farm can add their fields to it.")
+    field = db.query(Field).filter(Field.id == field_id, Field.user_id == farm.user_id).first()
+    if not field:
+        raise HTTPException(status_code=404, detail="Field not found")
+
+    membership = db.get(FarmField, field.id)
+    if membership is None:
+        db.add(FarmField(field_id=field.id, farm_id=farm.id))
+    else:
+        membership.farm_id = farm.id
+    db.flush()
+    update_field_demands(db, [field.id])
+    return db.get(FieldDemand, field.id)
+
+def remove_farm_field(db: Session, farm: Farm, field_id: int):
+    removed = db.query(FarmField).filter(
+        FarmField.farm_id == farm.id,
+        FarmField.field_id == field_id,
+    ).delete()
+    if not removed:
+        raise HTTPException(status_code=404, detail="Field not found in this farm")
+    db.flush()
+    update_field_demands(db, [field_id])
+
+def get_farm_field_demands(db: Session, farm_id: int):
+    return db.query(FieldDemand).filter(FieldDemand.farm_id == farm_id).order_by(FieldDemand.field_id).all()
@@ -0,0 +1,240 @@
+import asyncio
+from collections import defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import SessionLocal
+from app.models.field import Field
+from app.services.climate_service import get_weather_data_bulk, weather_cache, weather_key
+from app.services.irrigation_service import calculate_fields_metrics
+from app.services.quota_service import Priority, upstream_priority
+
+# Seconds between keep-alive comments on idle streams.
+KEEPALIVE_INTERVAL = 15
+# Seconds between checks for expired weather of the subscribed locations.
+REFRESH_INTERVAL = 60
+# Events kept for a slow subscriber before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 64
+
+class FieldState(NamedTuple):
+    user_id: int
+    crop_name: str
+    # Key of the weather cache entry of the field.
+    cell: tuple
+
+class Subscriber:
+    def __init__(self, user_id: int, field_ids: Iterable[int]):
+        self.user_id = user_id
+        self.field_ids = set(field_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def send(self, event: bytes):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+def calculate_field_events(db: Session, fields: list[Field]) -> dict[int, tuple[FieldState, Optional[bytes]]]:
+    """The recommendation event of each field, None where it cannot be computed."""
+    metrics = calculate_fields_metrics(db, fields)
+    events = {}
+    for field in fields:
+        state = FieldState(field.user_id, field.crop_name, weather_key(field.lat, field.lon))
+        values = metrics[field.id]
+        if values is None:
+            events[field.id] = state, None
+            continue
+        events[field.id] = state, orjson.dumps({
+            "field": field.id,
+            "date": values["date"],
+            "NRt": round(values["NRt"], 2),
+            "Dt": round(values["Dt"], 2),
+            "I": round(values["I"], 2),
+        })
+    return events
+
+def _load_events(field_ids: Iterable[int], user_id: Optional[int] = None, all_fields: bool = False):
+    db = SessionLocal()
+    try:
+        query = db.query(Field)
+        if user_id is not None:
+            query = query.filter(Field.user_id == user_id)
+        if not all_fields:
+            query = query.filter(Field.id.in_(list(field_ids)))
+        return calculate_field_events(db, query.all())
+    finally:
+        db.close()
+
+def _refresh_weather(cells: list[tuple]):
+    with upstream_priority(Priority.PREFETCH):
+        get_weather_data_bulk(cells)
+
+class RecommendationHub:
+    """Pushes the NRt, Dt and I of fields to their subscribers when they change.
+
+    Subscriptions are indexed by weather cache entry, so a refreshed entry
+    recomputes each field in that weather cell once, and each field's event is
+    serialized once for all of its subscribers. Events identical to the last
+    one sent for a field are dropped.
+
+    State is only touched from the event loop; the `notify_*` methods may be
+    called from any thread.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self._subscribers: dict[int, set[Subscriber]] = defaultdict(set)
+        self._fields: dict[int, FieldState] = {}
+        self._cells: dict[tuple, set[int]] = defaultdict(set)
+        self._events: dict[int, bytes] = {}
+
+        self._dirty_cells: set[tuple] = set()
+        self._dirty_crops: set[tuple[int, str]] = set()
+        self._dirty_fields: set[int] = set()
+
+    def _mark(self, dirty: set, item):
+        dirty.add(item)
+        self._wake.set()
+
+    def _notify(self, dirty: set, item):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._mark, dirty, item)
+
+    def notify_cell(self, cell: tuple):
+        if cell in self._cells:
+            self._notify(self._dirty_cells, cell)
+
+    def notify_crop(self, user_id: int, crop_name: Optional[str] = None):
+        """Signal a changed crop, or every crop of the user if `crop_name` is None."""
+        if self._fields:
+            self._notify(self._dirty_crops, (user_id, crop_name))
+
+    def notify_field(self, field_id: int):
+        if field_id in self._fields:
+            self._notify(self._dirty_fields, field_id)
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def subscribe(self, user_id: int, field_ids: Optional[list[int]] = None) -> Subscriber:
+        """Subscribe to some fields of a user, or to all of them if `field_ids` is None."""
+        self._start()
+        events = await run_in_threadpool(
+            _load_events, field_ids or (), user_id=user_id, all_fields=field_ids is None,
+        )
+        missing = set(field_ids or ()) - events.keys()
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Fields not found: {sorted(missing)}")
+
+        subscriber = Subscriber(user_id, events)
+        for field_id in subscriber.field_ids:
+            self._subscribers[field_id].add(subscriber)
+        self._publish(events, skip=subscriber)
+        for field_id in subscriber.field_ids:
+            if field_id in self._events:
+                subscriber.send(self._events[field_id])
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        for field_id in subscriber.field_ids:
+            subscribers = self._subscribers.get(field_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[field_id]
+                self._forget(field_id)
+
+    def _forget(self, field_id: int):
+        state = self._fields.pop(field_id, None)
+        self._events.pop(field_id, None)
+        if state is not None:
+            self._cells[state.cell].discard(field_id)
+            if not self._cells[state.cell]:
+                del self._cells[state.cell]
+
+    def _publish(
+            self,
+            events: dict[int, tuple[FieldState, Optional[bytes]]],
+            skip: Optional[Subscriber] = None,
+    ):
+        for field_id, (state, event) in events.items():
+            if field_id not in self._subscribers:
+                continue
+            previous = self._fields.get(field_id)
+            if previous != state:
+                self._forget(field_id)
+                self._fields[field_id] = state
+                self._cells[state.cell].add(field_id)
+            if event is None or event == self._events.get(field_id):
+                continue
+            self._events[field_id] = event
+            for subscriber in self._subscribers[field_id]:
+                if subscriber is not skip:
+                    subscriber.send(event)
+
+    def _take_dirty(self) -> set[int]:
+        field_ids = self._dirty_fields & self._fields.keys()
+        for cell in self._dirty_cells:
+            field_ids |= self._cells.get(cell, set())
+        for user_id, crop_name in self._dirty_crops:
+            field_ids |= {
+                field_id
+                for field_id, state in self._fields.items()
+                if state.user_id == user_id and crop_name in (None, state.crop_name)
+            }
+        self._dirty_cells.clear()
+        self._dirty_crops.clear()
+        self._dirty_fields.clear()
+        return field_ids
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                # Expired entries are refetched here; storing them notifies
+                # their cells, which are recomputed on the next pass.
+                expired = [cell for cell in self._cells if cell not in weather_cache]
+                if expired:
+                    await run_in_threadpool(_refresh_weather, expired)
+
+                field_ids = self._take_dirty()
+                if field_ids:
+                    events = await run_in_threadpool(_load_events, field_ids)
+                    for field_id in field_ids - events.keys():
+                        # Deleted fields stop being tracked.
+                        self._forget(field_id)
+                    self._publish(events)
+            except Exception as e:
+                print(f"[ERROR] Failed to push recommendations: {e}")
+
+    async def events(self, subscriber: Subscriber):
+        """Server-sent events stream of a subscriber."""
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"event: recommendation\ndata: " + event + b"\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+recommendation_hub = RecommendationHub()
+weather_cache.listeners.append(recommendation_hub.notify_cell)
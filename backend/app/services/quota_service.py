@@ -0,0 +1,199 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+
+from app.core.config import settings
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BATCH = 2
+    BACKFILL = 3
+
+# Fraction of every bucket kept out of reach of each priority, so that lower
+# priorities stop spending first and interactive requests keep a reserve.
+RESERVES = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.PREFETCH: 0.1,
+    Priority.BATCH: 0.25,
+    Priority.BACKFILL: 0.5,
+}
+
+# Seconds a fetch of each priority may be deferred waiting for budget before
+# it is rejected. Interactive fetches are never deferred.
+MAX_DEFERRAL = {
+    Priority.INTERACTIVE: 0,
+    Priority.PREFETCH: 10,
+    Priority.BATCH: 600,
+    Priority.BACKFILL: 3600,
+}
+
+class QuotaExceeded(Exception):
+    """Raised when a fetch cannot get its budget; `retry_after` is None if it never can."""
+
+    def __init__(self, priority: Priority, retry_after: Optional[float]):
+        if retry_after is None:
+            message = f"Upstream call too large for the {priority.name.lower()} budget"
+        else:
+            message = f"Upstream quota exhausted for {priority.name.lower()} requests, retry in {retry_after:.1f}s"
+        super().__init__(message)
+        self.priority = priority
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Allows `capacity` calls per `period` seconds, refilled continuously."""
+
+    def __init__(self, name: str, capacity: float, period: float):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, reserve: float) -> float:
+        """Seconds until `cost` tokens can be taken without going under the reserve."""
+        missing = cost + reserve * self.capacity - self.tokens
+        return max(missing, 0) / self.rate
+
+class UpstreamBudget:
+    """Budget of weather API calls, shared by every fetch of the process.
+
+    A call is taken from all the buckets at once, each bucket being one of
+    the provider's quota windows. The priority of the caller, set with
+    `upstream_priority`, decides how much of the budget it may use and how
+    long it may wait for it.
+    """
+
+    def __init__(self, limits: dict[str, tuple[int, float]], share: float = 1):
+        self.limits = limits
+        self._lock = threading.Lock()
+        self.set_share(share)
+        self.used = {priority: 0 for priority in Priority}
+        self.deferred = {priority: 0 for priority in Priority}
+        self.deferred_seconds = {priority: 0.0 for priority in Priority}
+        self.rejected = {priority: 0 for priority in Priority}
+        self.waiting = 0
+
+    def set_share(self, share: float):
+        """Give this process `share` of the provider's quotas."""
+        with self._lock:
+            self.share = share
+            self.buckets = [
+                TokenBucket(name, capacity * share, period)
+                for name, (capacity, period) in self.limits.items()
+            ]
+
+    def _try_take(self, cost: float, priority: Priority) -> float:
+        now = time.monotonic()
+        for bucket in self.buckets:
+            bucket.refill(now)
+        wait = max(bucket.wait_time(cost, RESERVES[priority]) for bucket in self.buckets)
+        if wait == 0:
+            for bucket in self.buckets:
+                bucket.tokens -= cost
+            self.used[priority] += cost
+        return wait
+
+    def max_cost(self, priority: Optional[Priority] = None) -> float:
+        """Largest cost a single call of the priority can ever be granted."""
+        priority = priority if priority is not None else current_priority.get()
+        with self._lock:
+            return min(bucket.capacity for bucket in self.buckets) * (1 - RESERVES[priority])
+
+    def acquire(self, cost: float = 1, priority: Optional[Priority] = None):
+        """Take `cost` calls from the budget, waiting if the priority allows it.
+
+        Raises:
+            QuotaExceeded: If the budget cannot be spent within the deferral
+                limit of the priority, at once if `cost` exceeds `max_cost`.
+        """
+        priority = priority if priority is not None else current_priority.get()
+        if cost > self.max_cost(priority):
+            # Would never fit, however long it waited.
+            with self._lock:
+                self.rejected[priority] += 1
+            raise QuotaExceeded(priority, None)
+        deadline = time.monotonic() + MAX_DEFERRAL[priority]
+        deferred = False
+        started = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_take(cost, priority)
+                    if wait == 0:
+                        return
+                    if time.monotonic() + wait > deadline:
+                        self.rejected[priority] += 1
+                        raise QuotaExceeded(priority, wait)
+                    if not deferred:
+                        deferred = True
+                        self.deferred[priority] += 1
+                        self.waiting += 1
+                time.sleep(wait)
+        finally:
+            if deferred:
+                with self._lock:
+                    self.waiting -= 1
+                    self.deferred_seconds[priority] += time.monotonic() - started
+
+    def metrics(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+            return {
+                "share": self.share,
+                "buckets": [
+                    {
+                        "name": bucket.name,
+                        "capacity": round(bucket.capacity, 2),
+                        "period": bucket.period,
+                        "remaining": round(bucket.tokens, 2),
+                        "used_ratio": round(1 - bucket.tokens / bucket.capacity, 4),
+                    }
+                    for bucket in self.buckets
+                ],
+                "waiting": self.waiting,
+                "priorities": {
+                    priority.name.lower(): {
+                        "used": self.used[priority],
+                        "deferred": self.deferred[priority],
+                        "deferred_seconds": round(self.deferred_seconds[priority], 2),
+                        "rejected": self.rejected[priority],
+                    }
+                    for priority in Priority
+                },
+            }
+
+current_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+
+@contextmanager
+def upstream_priority(priority: Priority):
+    """Run the weather fetches of a block with the given priority."""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+# The API process keeps what background job workers do not get, see
+# `job_service`, so that the processes together stay within the quotas.
+upstream_budget = UpstreamBudget(
+    limits={
+        "minute": (settings.UPSTREAM_CALLS_PER_MINUTE, 60),
+        "hour": (settings.UPSTREAM_CALLS_PER_HOUR, 3600),
+        "day": (settings.UPSTREAM_CALLS_PER_DAY, 86400),
+    },
+    share=1 - settings.UPSTREAM_JOB_SHARE,
+)
@@ -0,0 +1,74 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.allocation_service import M3_PER_MM_HA
+
+def calculate_duration(Dt: np.ndarray, area: np.ndarray, flow: np.ndarray) -> np.ndarray:
+    """Time needed to apply the gross dose of each zone.
+
+    Args:
+        Dt (np.ndarray): Dose totale d’arrosage [mm] of each zone.
+        area (np.ndarray): Area of each zone [ha].
+        flow (np.ndarray): Flow rate of each zone valve [m3/h].
+
+    Returns:
+        np.ndarray: Irrigation duration of each zone [h].
+    """
+    return Dt * area * M3_PER_MM_HA / flow
+
+def build_schedule(
+        duration: np.ndarray,
+        flow: np.ndarray,
+        pump_capacity: float,
+        window_hours: float = 24,
+        slot_minutes: int = 5,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Place zone runs in an irrigation window while flattening the pump load.
+
+    The window is split into slots of `slot_minutes`. Zones are placed by
+    decreasing volume, each one at the earliest start where the highest load
+    it overlaps is the lowest, which keeps the peak demand down. Zones that
+    would exceed the pump capacity wherever they start are left unscheduled.
+
+    Args:
+        duration (np.ndarray): Irrigation duration of each zone [h].
+        flow (np.ndarray): Flow rate of each zone valve [m3/h].
+        pump_capacity (float): Maximum flow the pump can deliver [m3/h].
+        window_hours (float): Length of the irrigation window [h].
+        slot_minutes (int): Scheduling resolution [min].
+
+    Returns:
+        tuple: The start slot of each zone (-1 when unscheduled) and the load
+        of each slot [m3/h].
+    """
+    n_slots = int(window_hours * 60 // slot_minutes)
+    length = np.ceil(duration * 60 / slot_minutes).astype(np.int64)
+    start = np.full(len(duration), -1, dtype=np.int64)
+    load = np.zeros(n_slots, dtype=np.float64)
+
+    for zone in np.argsort(-(duration * flow), kind="stable"):
+        k = int(length[zone])
+        if k == 0:
+            start[zone] = 0
+            continue
+        if k > n_slots:
+            continue
+        # Highest load over every window of k slots, for each possible start.
+        overlap = sliding_window_view(load, k).max(axis=1)
+        best = int(np.argmin(overlap))
+        if overlap[best] + flow[zone] > pump_capacity:
+            continue
+        start[zone] = best
+        load[best:best + k] += flow[zone]
+
+    return start, load
+
+def format_time(start_hour: float, slots: int, slot_minutes: int) -> str:
+    minutes = int(round(start_hour * 60)) + slots * slot_minutes
+    hours, minutes = divmod(minutes % (24 * 60), 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+def is_due(I: float, days_since_last: int | None) -> bool:
+    """Whether a zone with an interval of `I` days has to be irrigated today."""
+    return days_since_last is None or days_since_last >= math.floor(I)
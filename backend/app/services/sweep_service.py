@@ -0,0 +1,45 @@
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.schemas.irrigation import SweepInput, SweepRange
+from app.services.irrigation_service import MAX_SWEEP_COMBINATIONS, calculate_NRt_sweep
+
+def sweep_shape(data: SweepInput) -> list[int]:
+    """Length of each axis of the sweep, checking the number of combinations."""
+    # Ranges are counted, not expanded, until the total is known to fit.
+    shape = [
+        values.count if isinstance(values, SweepRange) else len(values)
+        for values in (data.CEa, data.EL, data.CU, data.Fr, data.texture)
+    ]
+    if not all(shape) or np.prod(shape) > MAX_SWEEP_COMBINATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A sweep needs between 1 and {MAX_SWEEP_COMBINATIONS} combinations.",
+        )
+    return shape
+
+def run_sweep(db: Session, data: SweepInput) -> dict:
+    """Evaluate NRt over every combination of the field settings of a sweep."""
+    shape = sweep_shape(data)
+    axes = data.axes()
+
+    NRn, Ea, NRt = calculate_NRt_sweep(
+        db=db,
+        crop_name=data.crop_name,
+        lat=data.lat,
+        lon=data.lon,
+        CEa=np.array(axes["CEa"]),
+        EL=np.array(axes["EL"]),
+        CU=np.array(axes["CU"]),
+        Fr=np.array(axes["Fr"]),
+        textures=data.texture,
+    )
+
+    return {
+        "NRn": round(NRn, 2),
+        "axes": axes,
+        "shape": shape,
+        "Ea": np.round(Ea, 4).ravel(),
+        "NRt": np.round(NRt, 2).ravel(),
+    }
@@ -0,0 +1,297 @@
+import atexit
+import json
+import math
+import threading
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import case, insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.db.upsert import dialect_insert
+from app.models.telemetry import TelemetryRollup, readings_partition
+
+class Metric(str, Enum):
+    MOISTURE = "moisture"   # [mm/cm], same unit as SOIL_PROPERTIES
+    FLOW = "flow"           # [m3/h]
+
+class Granularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+# Compact binary format: a sequence of little-endian records of sensor number,
+# UNIX timestamp, value and metric code (index in `Metric`).
+BINARY_RECORD = np.dtype([
+    ("sensor", "<u4"),
+    ("ts", "<f8"),
+    ("value", "<f4"),
+    ("metric", "u1"),
+])
+METRIC_CODES = tuple(Metric)
+
+class TelemetryBufferFull(Exception):
+    pass
+
+def _to_utc(value) -> datetime:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+    ts = datetime.fromisoformat(value)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+def _to_value(value) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Value must be finite, got {value}")
+    return value
+
+def parse_ndjson(body: bytes) -> list[tuple]:
+    """Parse newline-delimited JSON readings.
+
+    Each line is an object with `sensor_id`, `metric`, `ts` (ISO 8601 or UNIX
+    timestamp) and `value`.
+
+    Raises:
+        ValueError: If a line is not a valid reading.
+    """
+    readings = []
+    for number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            readings.append((
+                str(item["sensor_id"]),
+                Metric(item["metric"]).value,
+                _to_utc(item["ts"]),
+                _to_value(item["value"]),
+            ))
+        except (KeyError, TypeError, ValueError, OverflowError, OSError) as e:
+            # Out of range timestamps raise OverflowError or OSError.
+            raise ValueError(f"Invalid reading on line {number}: {e}")
+    return readings
+
+def parse_binary(body: bytes) -> list[tuple]:
+    """Parse readings packed as `BINARY_RECORD` records.
+
+    Raises:
+        ValueError: If the body is not a whole number of valid records.
+    """
+    if len(body) % BINARY_RECORD.itemsize:
+        raise ValueError(f"Body size is not a multiple of {BINARY_RECORD.itemsize} bytes.")
+    records = np.frombuffer(body, dtype=BINARY_RECORD)
+    if len(records) and records["metric"].max() >= len(METRIC_CODES):
+        raise ValueError("Invalid metric code.")
+    if not np.isfinite(records["value"]).all():
+        raise ValueError("Values must be finite.")
+
+    metrics = [metric.value for metric in METRIC_CODES]
+    try:
+        return [
+            (str(sensor), metrics[metric], _to_utc(ts), value)
+            for sensor, ts, value, metric in zip(
+                records["sensor"].tolist(),
+                records["ts"].tolist(),
+                records["value"].tolist(),
+                records["metric"].tolist(),
+            )
+        ]
+    except (ValueError, OverflowError, OSError) as e:
+        raise ValueError(f"Invalid timestamp: {e}")
+
+def _rollup_buckets(ts: datetime):
+    yield Granularity.HOUR.value, ts.replace(minute=0, second=0, microsecond=0)
+    yield Granularity.DAY.value, ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def write_readings(conn, readings: list[tuple]):
+    """Bulk insert readings into their monthly partitions and fold them into the rollups.
+
+    Args:
+        conn: An open connection, in a transaction.
+        readings (list): (user_id, sensor_id, metric, ts, value) tuples.
+    """
+    partitions: dict[str, list[dict]] = {}
+    rollups: dict[tuple, list] = {}
+    for user_id, sensor_id, metric, ts, value in readings:
+        partitions.setdefault(ts.strftime("%Y%m"), []).append({
+            "user_id": user_id,
+            "sensor_id": sensor_id,
+            "metric": metric,
+            "ts": ts,
+            "value": value,
+        })
+        for granularity, bucket in _rollup_buckets(ts):
+            key = (user_id, sensor_id, metric, granularity, bucket)
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollups[key] = [1, value, value, value, ts, value]
+                continue
+            rollup[0] += 1
+            rollup[1] += value
+            rollup[2] = min(rollup[2], value)
+            rollup[3] = max(rollup[3], value)
+            if ts >= rollup[4]:
+                rollup[4], rollup[5] = ts, value
+
+    for month, rows in partitions.items():
+        partition = readings_partition(month)
+        partition.create(conn, checkfirst=True)
+        conn.execute(insert(partition), rows)
+
+    table = TelemetryRollup.__table__
+    stmt = dialect_insert(conn, table)
+    newer = stmt.excluded.last_ts >= table.c.last_ts
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key.columns],
+            set_={
+                "count": table.c.count + stmt.excluded.count,
+                "total": table.c.total + stmt.excluded.total,
+                "minimum": case(
+                    (stmt.excluded.minimum < table.c.minimum, stmt.excluded.minimum),
+                    else_=table.c.minimum,
+                ),
+                "maximum": case(
+                    (stmt.excluded.maximum > table.c.maximum, stmt.excluded.maximum),
+                    else_=table.c.maximum,
+                ),
+                "last_ts": case((newer, stmt.excluded.last_ts), else_=table.c.last_ts),
+                "last_value": case((newer, stmt.excluded.last_value), else_=table.c.last_value),
+            },
+        ),
+        [
+            {
+                "user_id": user_id,
+                "sensor_id": sensor_id,
+                "metric": metric,
+                "granularity": granularity,
+                "bucket": bucket,
+                "count": count,
+                "total": total,
+                "minimum": minimum,
+                "maximum": maximum,
+                "last_ts": last_ts,
+                "last_value": last_value,
+            }
+            for (user_id, sensor_id, metric, granularity, bucket), (
+                count, total, minimum, maximum, last_ts, last_value
+            ) in rollups.items()
+        ],
+    )
+
+class TelemetryBuffer:
+    """In-memory buffer of readings, written in bulk by a background thread.
+
+    Readings are flushed every `flush_interval` seconds, or as soon as
+    `flush_size` of them are pending, so API workers only append to a list.
+    """
+
+    def __init__(self, flush_size: int = 5000, flush_interval: float = 1.0, max_pending: int = 500_000):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, user_id: int, readings: list[tuple]) -> int:
+        with self._lock:
+            if len(self._pending) + len(readings) > self.max_pending:
+                raise TelemetryBufferFull()
+            self._pending.extend((user_id, *reading) for reading in readings)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.flush_size:
+                self._wake.set()
+        return len(readings)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                with engine.begin() as conn:
+                    write_readings(conn, batch)
+            except (IntegrityError, DataError, TypeError, ValueError) as e:
+                # Retrying would fail again; the valid readings are written one
+                # by one and the rejected ones dropped.
+                print(f"[ERROR] Failed to write {len(batch)} telemetry readings, writing them one by one: {e}")
+                self._write_each(batch)
+            except Exception as e:
+                # Transient failures, e.g. a lost connection: the batch is put
+                # back ahead of newer readings and retried on the next flush;
+                # while it is pending, `add` refuses readings beyond
+                # `max_pending`, and only what exceeds it is dropped.
+                with self._lock:
+                    self._pending[:0] = batch
+                    dropped = len(self._pending) - self.max_pending
+                    if dropped > 0:
+                        del self._pending[:dropped]
+                print(
+                    f"[ERROR] Failed to write {len(batch)} telemetry readings, "
+                    f"retrying{f' ({dropped} oldest dropped)' if dropped > 0 else ''}: {e}"
+                )
+
+    def _write_each(self, batch: list[tuple]):
+        dropped = 0
+        for reading in batch:
+            try:
+                with engine.begin() as conn:
+                    write_readings(conn, [reading])
+            except (IntegrityError, DataError, TypeError, ValueError) as e:
+                dropped += 1
+                print(f"[ERROR] Dropped invalid telemetry reading {reading}: {e}")
+        if dropped:
+            print(f"[ERROR] Dropped {dropped} of {len(batch)} telemetry readings")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+telemetry_buffer = TelemetryBuffer()
+atexit.register(telemetry_buffer.flush)
+
+def get_rollups(
+        db: Session,
+        user_id: int,
+        sensor_id: str,
+        metric: Metric,
+        granularity: Granularity,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+):
+    query = db.query(TelemetryRollup).filter(
+        TelemetryRollup.user_id == user_id,
+        TelemetryRollup.sensor_id == sensor_id,
+        TelemetryRollup.metric == metric.value,
+        TelemetryRollup.granularity == granularity.value,
+    )
+    if start is not None:
+        query = query.filter(TelemetryRollup.bucket >= start)
+    if end is not None:
+        query = query.filter(TelemetryRollup.bucket < end)
+    return query.order_by(TelemetryRollup.bucket).all()
+
+def get_latest_rollup(db: Session, user_id: int, sensor_id: str, metric: Metric):
+    return db.query(TelemetryRollup).filter(
+        TelemetryRollup.user_id == user_id,
+        TelemetryRollup.sensor_id == sensor_id,
+        TelemetryRollup.metric == metric.value,
+        TelemetryRollup.granularity == Granularity.HOUR.value,
+    ).order_by(TelemetryRollup.bucket.desc()).first()
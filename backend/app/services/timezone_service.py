@@ -0,0 +1,37 @@
+import threading
+from datetime import timezone, tzinfo
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from cachetools import LRUCache, cached
+from cachetools.keys import hashkey
+from timezonefinder import TimezoneFinder
+
+# Coordinates are rounded to this many decimals (about 1 km) before the
+# lookup, so fields of a farm share an entry.
+TIMEZONE_PRECISION = 2
+
+timezone_cache = LRUCache(maxsize=65536)
+
+_finder: Optional[TimezoneFinder] = None
+_finder_lock = threading.Lock()
+
+def _get_finder() -> TimezoneFinder:
+    # The timezone polygons take a while to load, so only on first use.
+    global _finder
+    with _finder_lock:
+        if _finder is None:
+            _finder = TimezoneFinder(in_memory=True)
+        return _finder
+
+def _timezone_key(lat: float, lon: float):
+    return hashkey(round(lat, TIMEZONE_PRECISION), round(lon, TIMEZONE_PRECISION))
+
+@cached(timezone_cache, key=_timezone_key, lock=threading.Lock())
+def get_timezone(lat: float, lon: float) -> tzinfo:
+    """Local timezone of a location, from the offline timezone polygons.
+
+    Locations outside of every polygon fall back to UTC.
+    """
+    name = _get_finder().timezone_at(lat=lat, lng=lon)
+    return ZoneInfo(name) if name else timezone.utc
@@ -1,4 +1,8 @@
+from cachetools import TTLCache
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from typing import Optional
+from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.utils.hashing import hash_password
@@ -20,3 +24,70 @@ def get_users(db: Session):
 def delete_user(db: Session, user: User):
     db.delete(user)
     db.commit()
+
+def _filter_users(query, role: Optional[str] = None, email_prefix: Optional[str] = None):
+    if role is not None:
+        query = query.filter(User.role == role)
+    if email_prefix:
+        query = query.filter(User.email.startswith(email_prefix, autoescape=True))
+    return query
+
+def get_users_page(
+        db: Session,
+        after: Optional[int] = None,
+        limit: int = 100,
+        role: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+):
+    """Return a page of users ordered by id, and the cursor of the next page."""
+    query = _filter_users(db.query(User), role=role, email_prefix=email_prefix)
+    if after is not None:
+        query = query.filter(User.id > after)
+
+    # One extra row tells whether there is a next page.
+    users = query.order_by(User.id).limit(limit + 1).all()
+    if len(users) > limit:
+        return users[:limit], users[limit - 1].id
+    return users, None
+
+# Counting is a full scan, so counts are reused for a minute.
+user_count_cache = TTLCache(maxsize=256, ttl=60)
+
+def count_users(db: Session, role: Optional[str] = None, email_prefix: Optional[str] = None) -> int:
+    key = (role, email_prefix)
+    count = user_count_cache.get(key)
+    if count is None:
+        count = user_count_cache[key] = _filter_users(
+            db.query(func.count(User.id)), role=role, email_prefix=email_prefix
+        ).scalar()
+    return count
+
+def iter_users(
+        role: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+        batch_size: int = 1000,
+):
+    """Yield users in id order, loading `batch_size` of them at a time.
+
+    A dedicated session is used, so the iterator can outlive the request's.
+    """
+    db = SessionLocal()
+    try:
+        # None until the first page, as ids start at 0 (see create_admin.py).
+        after: Optional[int] = None
+        while True:
+            query = db.query(User)
+            if after is not None:
+                query = query.filter(User.id > after)
+            users = _filter_users(
+                query,
+                role=role,
+                email_prefix=email_prefix,
+            ).order_by(User.id).limit(batch_size).all()
+            if not users:
+                return
+            yield from users
+            after = users[-1].id
+            db.expunge_all()
+    finally:
+        db.close()
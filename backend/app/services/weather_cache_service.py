@@ -0,0 +1,90 @@
+import time
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.field import Field
+from app.services.climate_service import get_weather_data_bulk, weather_cache, weather_cell, weather_key
+from app.services.quota_service import Priority, upstream_priority
+
+def get_cache_stats() -> dict:
+    with weather_cache.lock:
+        payloads = [payload for _, payload in weather_cache.snapshot()]
+        lookups = weather_cache.hits + weather_cache.misses
+        return {
+            "size": weather_cache.currsize,
+            "maxsize": weather_cache.maxsize,
+            "ttl": weather_cache.ttl,
+            "nbytes": sum(payload.nbytes for payload in payloads),
+            "hits": weather_cache.hits,
+            "misses": weather_cache.misses,
+            "hit_ratio": round(weather_cache.hits / lookups, 4) if lookups else None,
+            "evictions": weather_cache.evictions,
+            "expirations": weather_cache.expirations,
+        }
+
+def list_cache_entries() -> list[dict]:
+    now = time.time()
+    return [
+        {
+            "lat": lat,
+            "lon": lon,
+            "age": round(now - payload.fetched_at, 1),
+            "nbytes": payload.nbytes,
+        }
+        for (lat, lon), payload in weather_cache.snapshot()
+    ]
+
+def invalidate_entry(lat: float, lon: float) -> int:
+    """Drop the entry of the weather cell containing a location."""
+    key = weather_key(lat, lon)
+    with weather_cache.lock:
+        if key not in weather_cache:
+            return 0
+        del weather_cache[key]
+    return 1
+
+def invalidate_region(
+        min_lat: Optional[float] = None,
+        min_lon: Optional[float] = None,
+        max_lat: Optional[float] = None,
+        max_lon: Optional[float] = None,
+) -> int:
+    """Drop the entries whose cell center is inside a bounding box; unset bounds are open."""
+    with weather_cache.lock:
+        keys = [
+            (lat, lon)
+            for lat, lon in list(weather_cache)
+            if (min_lat is None or lat >= min_lat)
+            and (max_lat is None or lat <= max_lat)
+            and (min_lon is None or lon >= min_lon)
+            and (max_lon is None or lon <= max_lon)
+        ]
+        for key in keys:
+            del weather_cache[key]
+    return len(keys)
+
+def warm_cache(db: Session, coordinates: list[tuple[float, float]], fields: bool = False) -> dict:
+    """Preload the weather of the given coordinates and, optionally, of every stored field.
+
+    Counts are of weather cells, as locations in the same cell share an entry.
+    """
+    coordinates = list(coordinates)
+    if fields:
+        coordinates += db.query(Field.lat, Field.lon).distinct().all()
+    coordinates = list(dict.fromkeys(weather_cell(float(lat), float(lon)) for lat, lon in coordinates))
+
+    with weather_cache.lock:
+        cached = sum(coordinate in weather_cache for coordinate in coordinates)
+    with upstream_priority(Priority.PREFETCH):
+        payloads = get_weather_data_bulk(coordinates)
+    loaded = sum(payload is not None for payload in payloads)
+
+    return {
+        "requested": len(coordinates),
+        "already_cached": cached,
+        "fetched": loaded - cached,
+        "failed": len(coordinates) - loaded,
+    }
+
+def resize_cache(maxsize: int) -> dict:
+    weather_cache.resize(maxsize)
+    return get_cache_stats()
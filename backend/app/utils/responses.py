@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON response encoded with orjson, numpy arrays included.
+
+    Returning it from an endpoint also skips the `response_model`
+    re-validation, so only use it for data built by the service itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
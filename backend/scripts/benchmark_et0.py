@@ -0,0 +1,35 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from app.services.et0_service import calculate_ET0
+
+def benchmark_et0(n_cells: int, days: int = 16, repeat: int = 3):
+    rng = np.random.default_rng(0)
+    shape = (n_cells, days)
+    Tmin = rng.uniform(5, 20, shape)
+    Tmax = Tmin + rng.uniform(5, 15, shape)
+    RHmin = rng.uniform(20, 60, shape)
+    RHmax = np.minimum(RHmin + rng.uniform(10, 40, shape), 100)
+    u2 = rng.uniform(0.5, 5, shape)
+    Rs = rng.uniform(5, 30, shape)
+    latitude = rng.uniform(20, 36, (n_cells, 1))
+    elevation = rng.uniform(0, 1500, (n_cells, 1))
+    day_of_year = np.arange(150, 150 + days)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ET0 = calculate_ET0(Tmin, Tmax, RHmin, RHmax, u2, latitude, day_of_year, elevation, Rs=Rs)
+        timings.append(time.perf_counter() - started)
+
+    print(
+        f"{n_cells:>7} cells x {days} days: {min(timings) * 1000:8.1f} ms, "
+        f"mean ET0 {np.nanmean(ET0):.2f} mm/day"
+    )
+
+if __name__ == "__main__":
+    for n_cells in (1000, 10_000, 100_000):
+        benchmark_et0(n_cells)
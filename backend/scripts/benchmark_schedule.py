@@ -0,0 +1,34 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from app.services.schedule_service import build_schedule, calculate_duration
+
+def benchmark_schedule(n_zones: int, repeat: int = 3):
+    rng = np.random.default_rng(0)
+    flow = rng.uniform(2, 20, n_zones)
+    duration = calculate_duration(
+        Dt=rng.uniform(2, 8, n_zones),
+        area=rng.uniform(0.05, 0.5, n_zones),
+        flow=flow,
+    )
+    # Enough capacity to run the whole day's volume at twice the average load.
+    pump_capacity = max(2 * float((duration * flow).sum()) / 24, float(flow.max()))
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        start, load = build_schedule(duration=duration, flow=flow, pump_capacity=pump_capacity)
+        timings.append(time.perf_counter() - started)
+
+    print(
+        f"{n_zones:>6} zones: {min(timings) * 1000:8.1f} ms, "
+        f"peak {load.max():8.1f} / {pump_capacity:8.1f} m3/h, "
+        f"{int((start < 0).sum())} unscheduled"
+    )
+
+if __name__ == "__main__":
+    for n_zones in (100, 1000, 5000):
+        benchmark_schedule(n_zones)
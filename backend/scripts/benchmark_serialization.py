@@ -0,0 +1,71 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.irrigation import GridOut, SweepOut
+from app.schemas.user import UserOut
+from app.utils.compression import BrotliCompressor, GzipCompressor
+from app.utils.responses import FastJSONResponse
+
+def timed(function, repeat: int = 5) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, body
+
+def default_encoding(model, content):
+    # What FastAPI does with a plain return value: validate it against the
+    # response model, walk it with jsonable_encoder, then json.dumps.
+    return lambda: JSONResponse(jsonable_encoder(model.model_validate(content))).body
+
+def sweep_payload():
+    rng = np.random.default_rng(0)
+    shape = [20, 10, 10, 4, 4]
+    Ea, NRt = rng.uniform(0.5, 1, shape), rng.uniform(1, 20, shape)
+    axes = {
+        "CEa": list(np.linspace(0.5, 5, 20)),
+        "EL": list(np.linspace(0.5, 1, 10)),
+        "CU": list(np.linspace(0.8, 1, 10)),
+        "Fr": [0.7, 0.8, 0.9, 1],
+        "texture": ["HEAVY", "COARSE", "MEDIUM", "FINE"],
+    }
+    fast = {"NRn": 5.0, "axes": axes, "shape": shape, "Ea": np.round(Ea, 4).ravel(), "NRt": np.round(NRt, 2).ravel()}
+    default = {**fast, "Ea": fast["Ea"].tolist(), "NRt": fast["NRt"].tolist()}
+    return SweepOut, default, fast
+
+def grid_payload():
+    bands = ["NRn_today", "NRt_today", "NRn_week", "NRt_week"]
+    grid = np.round(np.random.default_rng(0).uniform(0, 40, (4, 100, 100)), 2)
+    fast = {"bands": bands, "shape": grid.shape, "origin": [30.05, -9.95], "resolution": 0.1, "values": dict(zip(bands, grid))}
+    default = {**fast, "shape": list(grid.shape), "values": {band: values.tolist() for band, values in zip(bands, grid)}}
+    return GridOut, default, fast
+
+def users_payload():
+    users = [{"id": i, "email": f"member{i}@coop.org", "role": "user"} for i in range(5000)]
+    return UserOut, users, users
+
+def benchmark(name: str, model, default, fast):
+    if isinstance(default, list):
+        default_ms, body = timed(lambda: JSONResponse(jsonable_encoder([model.model_validate(item) for item in default])).body)
+    else:
+        default_ms, body = timed(default_encoding(model, default))
+    fast_ms, fast_body = timed(lambda: FastJSONResponse(fast).body)
+    gzip_ms, gzipped = timed(lambda: GzipCompressor(6).finish(fast_body))
+    brotli_ms, brotlied = timed(lambda: BrotliCompressor(4).finish(fast_body))
+    print(
+        f"{name:<8} default {default_ms:7.1f} ms  orjson {fast_ms:6.1f} ms  "
+        f"({default_ms / fast_ms:5.1f}x)  {len(fast_body) / 1024:7.0f} KiB  "
+        f"gzip {len(gzipped) / 1024:5.0f} KiB/{gzip_ms:5.1f} ms  "
+        f"br {len(brotlied) / 1024:5.0f} KiB/{brotli_ms:5.1f} ms"
+    )
+
+if __name__ == "__main__":
+    benchmark("sweep", *sweep_payload())
+    benchmark("grid", *grid_payload())
+    benchmark("users", *users_payload())
@@ -0,0 +1,27 @@
+import argparse
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import SessionLocal
+from app.services.onboarding_service import onboard_users
+from sqlalchemy.orm import Session
+
+def bulk_onboard(path: str, with_crops: bool):
+    db: Session = SessionLocal()
+
+    with open(path, encoding="utf-8-sig", newline="") as lines:
+        result = onboard_users(db, lines, with_crops=with_crops)
+    db.close()
+
+    for error in result["errors"]:
+        print(f"Line {error['line']}: {error['detail']}")
+    print(f"{result['created']} users created, {result['skipped']} skipped, {len(result['errors'])} invalid.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create users from a CSV file (email,password[,role]).")
+    parser.add_argument("csv", help="Path of the CSV file.")
+    parser.add_argument("--with-crops", action="store_true", help="Give each user the default crops.")
+    args = parser.parse_args()
+
+    bulk_onboard(args.csv, args.with_crops)
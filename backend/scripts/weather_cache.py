@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import sys
+
+import requests
+
+# The weather cache lives in the API process, so it is administered over HTTP.
+API_URL = os.environ.get("IRRIG_API_URL", "http://localhost:8000/api/v1")
+
+def login(email: str, password: str) -> dict:
+    response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def parse_coordinate(value: str) -> tuple[float, float]:
+    lat, lon = value.split(",")
+    return float(lat), float(lon)
+
+def run(args) -> dict:
+    headers = login(args.email, args.password)
+    url = f"{API_URL}/admin/cache/weather"
+
+    if args.command == "stats":
+        response = requests.get(url, headers=headers)
+    elif args.command == "entries":
+        response = requests.get(f"{url}/entries", headers=headers)
+    elif args.command == "invalidate" and args.location:
+        lat, lon = args.location
+        response = requests.delete(f"{url}/entries", params={"lat": lat, "lon": lon}, headers=headers)
+    elif args.command == "invalidate":
+        region = dict(zip(("min_lat", "min_lon", "max_lat", "max_lon"), args.bbox or ()))
+        response = requests.post(f"{url}/invalidate", json=region, headers=headers)
+    elif args.command == "warm":
+        body = {"coordinates": args.coordinates, "fields": args.fields}
+        response = requests.post(f"{url}/warm", json=body, headers=headers)
+    else:
+        response = requests.put(f"{url}/size", json={"maxsize": args.maxsize}, headers=headers)
+
+    response.raise_for_status()
+    return response.json()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and manage the weather cache of a running API.")
+    parser.add_argument("--email", default="admin@gmail.com", help="Admin account email.")
+    parser.add_argument("--password", default=os.environ.get("IRRIG_ADMIN_PASSWORD", "admin"), help="Admin account password.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="Show size and hit/miss/eviction counts.")
+    commands.add_parser("entries", help="List cached locations.")
+
+    invalidate = commands.add_parser("invalidate", help="Drop one location, a bounding box, or everything.")
+    target = invalidate.add_mutually_exclusive_group()
+    target.add_argument("--location", type=parse_coordinate, metavar="LAT,LON")
+    target.add_argument("--bbox", type=float, nargs=4, metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"))
+
+    warm = commands.add_parser("warm", help="Preload locations and/or all stored fields.")
+    warm.add_argument("coordinates", type=parse_coordinate, nargs="*", metavar="LAT,LON")
+    warm.add_argument("--fields", action="store_true", help="Also warm every stored field.")
+
+    resize = commands.add_parser("resize", help="Change the cache capacity.")
+    resize.add_argument("maxsize", type=int)
+
+    args = parser.parse_args()
+    try:
+        print(json.dumps(run(args), indent=2))
+    except requests.RequestException as e:
+        sys.exit(f"[ERROR] {e}")
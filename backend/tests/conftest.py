@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# Settings are read when the app is imported, so the tests get their own
+# database and keys before any test module imports it.
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BUNDLE_SIGNING_KEY", "11" * 32)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.dependencies.auth import get_current_user
+from app.main import app
+from app.models.user import User
+from app.services.crop_service import reset_user_crops
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def make_user(db):
+    """Create a user with the default crops."""
+    count = 0
+
+    def make(role: str = "user") -> User:
+        nonlocal count
+        count += 1
+        user = User(email=f"user{count}-{os.urandom(4).hex()}@test.com", hashed_password="x", role=role)
+        db.add(user)
+        db.commit()
+        reset_user_crops(db, user.id)
+        return user
+    return make
+
+@pytest.fixture
+def client(db):
+    """A client authenticated as `client.user`, which tests set."""
+    client = TestClient(app)
+    client.user = None
+    app.dependency_overrides[get_current_user] = lambda: db.get(User, client.user.id)
+    yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,69 @@
+import struct
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import orjson
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from app.services import bundle_service
+from app.services.bundle_service import BUNDLE_HEADER, MAX_BUNDLE_DAYS
+from app.services.climate_service import parse_weather_payload
+from test_climate_timezones import open_meteo_response
+
+FIELD = {
+    "name": "Plot", "crop_name": "tomate", "lat": -22.9, "lon": -47.1,
+    "area": 2.0, "texture": "MEDIUM", "CEa": 1.0, "EL": 2.0, "CU": 0.9,
+}
+
+@pytest.fixture
+def field_id(client, make_user, monkeypatch):
+    payload = parse_weather_payload(open_meteo_response(datetime(2026, 10, 19, 10, tzinfo=timezone.utc)))
+    monkeypatch.setattr(bundle_service, "get_weather_data", lambda lat, lon: payload)
+    monkeypatch.setattr(bundle_service, "get_timezone", lambda lat, lon: ZoneInfo("UTC"))
+    client.user = make_user()
+    return client.post("/api/v1/fields/", json=FIELD).json()["id"]
+
+def public_key(client) -> Ed25519PublicKey:
+    key = client.get("/api/v1/fields/bundle-key").json()
+    assert key["algorithm"] == "Ed25519"
+    return Ed25519PublicKey.from_public_bytes(bytes.fromhex(key["public_key"]))
+
+def test_json_bundle_is_signed(client, field_id):
+    response = client.get(f"/api/v1/fields/{field_id}/bundle?days=3")
+    assert response.status_code == 200
+    bundle = orjson.loads(response.content)
+    assert (bundle["field"], bundle["days"], len(bundle["NRt"])) == (field_id, 3, 3)
+    assert response.headers["ETag"] == f'"{bundle["etag"]}"'
+
+    signature = bytes.fromhex(bundle.pop("sig"))
+    public_key(client).verify(signature, orjson.dumps(bundle, option=orjson.OPT_SORT_KEYS))
+
+def test_binary_bundle_is_signed(client, field_id):
+    response = client.get(f"/api/v1/fields/{field_id}/bundle?days=3&format=binary")
+    assert response.status_code == 200
+    content, signature = response.content[:-64], response.content[-64:]
+    assert len(content) == BUNDLE_HEADER.size + 3 * 3 * 4
+    magic, _, field, _, days, *_ = BUNDLE_HEADER.unpack_from(content)
+    assert (magic, field, days) == (b"IRRB", field_id, 3)
+    public_key(client).verify(signature, content)
+
+    tampered = content[:-4] + struct.pack("<f", 0)
+    with pytest.raises(Exception):
+        public_key(client).verify(signature, tampered)
+
+def test_bundle_etag(client, field_id):
+    url = f"/api/v1/fields/{field_id}/bundle"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"{url}?format=binary").headers["ETag"] != etag
+
+    # Any change of the field's settings changes the bundle.
+    assert client.put(f"/api/v1/fields/{field_id}", json={**FIELD, "CU": 0.8}).status_code == 200
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+@pytest.mark.parametrize("days", (0, MAX_BUNDLE_DAYS + 1))
+def test_bundle_days_are_within_the_forecast(client, field_id, days):
+    assert client.get(f"/api/v1/fields/{field_id}/bundle?days={days}").status_code == 400
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from app.services.climate_service import _weather_params, parse_weather_payload
+from app.services.grid_service import WEEK_DAYS
+
+ZONES = (
+    "UTC",
+    "America/Sao_Paulo",
+    "America/Los_Angeles",
+    "Asia/Tokyo",
+    "Asia/Kolkata",
+    "Europe/Paris",
+    "Pacific/Kiritimati",   # UTC+14
+    "Pacific/Pago_Pago",    # UTC-11
+)
+
+def open_meteo_response(now: datetime) -> dict:
+    """Response of Open-Meteo at `now` (UTC) to the parameters we request, with constant values."""
+    params = _weather_params("0", "0")
+    start = datetime.combine(now.date(), datetime.min.time()) - timedelta(days=params["past_days"])
+    hours = 24 * (params["past_days"] + params["forecast_days"])
+    return {
+        "latitude": 0,
+        "longitude": 0,
+        "current": {
+            "time": now.strftime("%Y-%m-%dT%H:00"),
+            "precipitation": 0.0,
+            "temperature_2m": 20.0,
+            "relative_humidity_2m": 50,
+        },
+        "hourly": {
+            "time": [(start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(hours)],
+            "et0_fao_evapotranspiration": [0.25] * hours,
+            "precipitation": [0.0] * hours,
+        },
+    }
+
+@pytest.mark.parametrize("zone", ZONES)
+@pytest.mark.parametrize("utc_hour", (0, 5, 11, 17, 23))
+@pytest.mark.parametrize("day", ("2026-01-15", "2026-03-29", "2026-10-24"))
+def test_week_of_local_days_is_covered(zone, utc_hour, day):
+    now = datetime.fromisoformat(day).replace(hour=utc_hour, tzinfo=timezone.utc)
+    payload = parse_weather_payload(open_meteo_response(now))
+    tz = ZoneInfo(zone)
+
+    today = payload.local_date(tz)
+    assert today == now.astimezone(tz).date()
+
+    et0, precipitation = payload.daily_window(today, WEEK_DAYS, tz)
+    assert not np.isnan(et0).any()
+    assert not np.isnan(precipitation).any()
+    # Days are 23 to 25 hours long across DST changes.
+    assert np.all((et0 >= 23 * 0.25 - 1e-4) & (et0 <= 25 * 0.25 + 1e-4))
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.crop import Crop
+from app.models.field import Field
+from app.services import field_service
+from app.services.field_service import calculate_field_NRt
+
+def make_field(db, user, crop_name="tomate") -> Field:
+    field = Field(
+        user_id=user.id, name="Plot", crop_name=crop_name, lat=-22.9, lon=-47.1,
+        area=1.5, texture="MEDIUM", CEa=1.0, EL=2.0, CU=0.9,
+    )
+    db.add(field)
+    db.commit()
+    return field
+
+def test_nrt_uses_the_crop_of_the_field_owner(db, make_user):
+    owner, other = make_user(), make_user()
+    db.add(Crop(user_id=other.id, name="only-other", Kc=1.0, CEemax=2.5, H=50, f=0.5))
+    db.commit()
+    field = make_field(db, owner, crop_name="only-other")
+
+    with pytest.raises(HTTPException) as error:
+        calculate_field_NRt(db, field)
+    assert error.value.status_code == 404
+
+def test_nrt_without_climate_is_a_bad_gateway(db, make_user, monkeypatch):
+    field = make_field(db, make_user())
+    monkeypatch.setattr(field_service, "calculate_fields_metrics", lambda db, fields: {field.id: None})
+
+    with pytest.raises(HTTPException) as error:
+        calculate_field_NRt(db, field)
+    assert error.value.status_code == 502
+
+def test_nrt_of_the_field(db, make_user, monkeypatch):
+    field = make_field(db, make_user())
+    monkeypatch.setattr(field_service, "calculate_fields_metrics", lambda db, fields: {field.id: {"NRt": 4.2}})
+
+    assert calculate_field_NRt(db, field) == 4.2
@@ -0,0 +1,103 @@
+import pytest
+
+from app.services import demand_service
+from app.services.allocation_service import M3_PER_MM_HA
+
+FIELD = {
+    "name": "Plot", "crop_name": "tomate", "lat": -22.9, "lon": -47.1,
+    "area": 2.0, "texture": "MEDIUM", "CEa": 1.0, "EL": 2.0, "CU": 0.9,
+}
+
+@pytest.fixture(autouse=True)
+def metrics(monkeypatch):
+    """Field metrics without weather; a field's NRt is its CEa."""
+    def calculate_fields_metrics(db, fields):
+        return {field.id: {"NRt": field.CEa, "date": "2026-10-19"} for field in fields}
+    monkeypatch.setattr(demand_service, "calculate_fields_metrics", calculate_fields_metrics)
+
+def create_organization(client, manager) -> int:
+    client.user = manager
+    return client.post("/api/v1/organizations/", json={"name": "Coop"}).json()["id"]
+
+def join(client, organization_id, user, role="member"):
+    manager = client.user
+    assert client.put(f"/api/v1/organizations/{organization_id}/members/{user.id}", json={"role": role}).status_code == 200
+    client.user = user
+    assert client.post(f"/api/v1/organizations/{organization_id}/invitation").status_code == 200
+    client.user = manager
+
+def test_invited_user_is_not_a_member_until_accepting(client, make_user):
+    manager, user = make_user(), make_user()
+    organization_id = create_organization(client, manager)
+    response = client.put(f"/api/v1/organizations/{organization_id}/members/{user.id}", json={"role": "member"})
+    assert response.json()["accepted"] is False
+
+    # A manager cannot create farms for users who did not accept.
+    farm = {"name": "North", "user_id": user.id}
+    assert client.post(f"/api/v1/organizations/{organization_id}/farms", json=farm).status_code == 400
+
+    client.user = user
+    assert client.get("/api/v1/organizations/").json() == []
+    assert [o["id"] for o in client.get("/api/v1/organizations/invitations").json()] == [organization_id]
+    assert client.get(f"/api/v1/organizations/{organization_id}/farms").status_code == 404
+    assert client.post(f"/api/v1/organizations/{organization_id}/invitation").json()["accepted"] is True
+    assert [o["id"] for o in client.get("/api/v1/organizations/").json()] == [organization_id]
+
+    client.user = manager
+    assert client.post(f"/api/v1/organizations/{organization_id}/farms", json=farm).status_code == 200
+
+def test_manager_cannot_attach_fields_of_members(client, make_user):
+    manager, user, outsider = make_user(), make_user(), make_user()
+    organization_id = create_organization(client, manager)
+    join(client, organization_id, user)
+    farm_id = client.post(
+        f"/api/v1/organizations/{organization_id}/farms", json={"name": "North", "user_id": user.id},
+    ).json()["id"]
+
+    client.user = user
+    field_id = client.post("/api/v1/fields/", json=FIELD).json()["id"]
+    client.user = outsider
+    outsider_field_id = client.post("/api/v1/fields/", json=FIELD).json()["id"]
+
+    client.user = manager
+    url = f"/api/v1/organizations/{organization_id}/farms/{farm_id}/fields"
+    assert client.put(f"{url}/{field_id}").status_code == 403
+    assert client.put(f"{url}/{outsider_field_id}").status_code == 403
+
+    client.user = user
+    assert client.put(f"{url}/{outsider_field_id}").status_code == 404
+    assert client.put(f"{url}/{field_id}").status_code == 200
+
+def test_demand_rollups_follow_fields(client, make_user):
+    manager = make_user()
+    organization_id = create_organization(client, manager)
+    farms = [
+        client.post(f"/api/v1/organizations/{organization_id}/farms", json={"name": name}).json()["id"]
+        for name in ("North", "South")
+    ]
+    fields = [
+        client.post("/api/v1/fields/", json={**FIELD, "CEa": CEa}).json()["id"]
+        for CEa in (1.0, 2.0, 3.0)
+    ]
+    for farm_id, field_id in zip((farms[0], farms[0], farms[1]), fields):
+        url = f"/api/v1/organizations/{organization_id}/farms/{farm_id}/fields/{field_id}"
+        assert client.put(url).status_code == 200
+
+    demand = client.get(f"/api/v1/organizations/{organization_id}/demand?farms=true").json()
+    assert demand["fields"] == 3
+    assert demand["area"] == pytest.approx(6.0)
+    assert demand["demand"] == pytest.approx(6.0 * 2.0 * M3_PER_MM_HA)
+    assert [farm["demand"] for farm in demand["farms"]] == pytest.approx([
+        3.0 * 2.0 * M3_PER_MM_HA,
+        3.0 * 2.0 * M3_PER_MM_HA,
+    ])
+
+    # Moving a field between farms keeps the organization total.
+    client.put(f"/api/v1/organizations/{organization_id}/farms/{farms[1]}/fields/{fields[0]}")
+    demand = client.get(f"/api/v1/organizations/{organization_id}/demand?farms=true").json()
+    assert demand["demand"] == pytest.approx(6.0 * 2.0 * M3_PER_MM_HA)
+    assert [farm["fields"] for farm in demand["farms"]] == [1, 2]
+
+    client.delete(f"/api/v1/organizations/{organization_id}/farms/{farms[1]}")
+    demand = client.get(f"/api/v1/organizations/{organization_id}/demand").json()
+    assert (demand["fields"], demand["demand"]) == (1, pytest.approx(2.0 * 2.0 * M3_PER_MM_HA))
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.quota_service import MAX_DEFERRAL, Priority, QuotaExceeded, RESERVES, UpstreamBudget
+
+def make_budget(period: float = 86400) -> UpstreamBudget:
+    return UpstreamBudget({"window": (100, period)})
+
+def test_lower_priorities_keep_a_reserve():
+    budget = make_budget()
+    budget.acquire(75, Priority.INTERACTIVE)
+
+    # 25 calls are left; backfills keep half the bucket in reserve and
+    # cannot wait long enough for it to refill.
+    with pytest.raises(QuotaExceeded) as error:
+        budget.acquire(1, Priority.BACKFILL)
+    assert error.value.retry_after is not None
+    assert budget.metrics()["priorities"]["backfill"]["rejected"] == 1
+    budget.acquire(10, Priority.PREFETCH)
+    budget.acquire(15, Priority.INTERACTIVE)
+
+def test_interactive_requests_are_never_deferred():
+    budget = make_budget(period=60)
+    budget.acquire(100, Priority.INTERACTIVE)
+    with pytest.raises(QuotaExceeded) as error:
+        budget.acquire(1, Priority.INTERACTIVE)
+    assert error.value.retry_after == pytest.approx(0.6, abs=0.01)
+    assert MAX_DEFERRAL[Priority.INTERACTIVE] == 0
+
+@pytest.mark.parametrize("priority", list(Priority))
+def test_calls_larger_than_the_budget_are_rejected_at_once(priority):
+    budget = make_budget()
+    assert budget.max_cost(priority) == pytest.approx(100 * (1 - RESERVES[priority]))
+    with pytest.raises(QuotaExceeded) as error:
+        budget.acquire(budget.max_cost(priority) + 1, priority)
+    # It would never fit, so it does not wait.
+    assert error.value.retry_after is None
+    assert budget.metrics()["priorities"][priority.name.lower()]["deferred"] == 0
+
+def test_share_scales_the_budget():
+    budget = make_budget()
+    budget.set_share(0.3)
+    assert budget.max_cost(Priority.INTERACTIVE) == pytest.approx(30)
@@ -0,0 +1,54 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.irrigation import SweepInput, SweepRange
+from app.services.irrigation_service import MAX_SWEEP_COMBINATIONS
+
+SWEEP = {"crop_name": "tomate", "lat": -22.9, "lon": -47.1, "CEa": [1.0], "EL": [2.0], "CU": [0.9]}
+
+def test_range_values():
+    assert SweepRange(start=1, stop=2, step=0.25).values() == [1, 1.25, 1.5, 1.75, 2]
+    assert SweepRange(start=2, stop=1, step=0.5).values() == []
+
+@pytest.mark.parametrize("bounds", (
+    {"start": 0, "stop": 1, "step": 1e-9},
+    # The span overflows to infinity.
+    {"start": -1.7e308, "stop": 1.7e308, "step": 1},
+    {"start": 0, "stop": 1e308, "step": 1e-308},
+))
+def test_range_is_bounded(bounds):
+    with pytest.raises(ValidationError):
+        SweepRange(**bounds)
+
+@pytest.mark.parametrize("bounds", (
+    {"start": float("nan"), "stop": 1, "step": 1},
+    {"start": 0, "stop": float("inf"), "step": 1},
+    {"start": 0, "stop": 1, "step": 0},
+))
+def test_range_bounds_are_finite_and_step_positive(bounds):
+    with pytest.raises(ValidationError):
+        SweepRange(**bounds)
+
+def test_range_at_the_limit():
+    assert SweepRange(start=1, stop=MAX_SWEEP_COMBINATIONS, step=1).count == MAX_SWEEP_COMBINATIONS
+
+@pytest.mark.parametrize("EL", ([2.0, 0.0], [-1.0], {"start": 0, "stop": 2, "step": 1}))
+def test_EL_must_be_positive(EL):
+    with pytest.raises(ValidationError):
+        SweepInput(**{**SWEEP, "EL": EL})
+
+def test_invalid_sweep_is_unprocessable(client):
+    for body in (
+        {**SWEEP, "CEa": {"start": -1.7e308, "stop": 1.7e308, "step": 1}},
+        {**SWEEP, "EL": [0]},
+    ):
+        assert client.post("/api/v1/irrigation/sweep", json=body).status_code == 422
+
+    # NaN is echoed in the errors, which must still be valid JSON.
+    response = client.post(
+        "/api/v1/irrigation/sweep",
+        content=b'{"crop_name": "tomate", "lat": 0, "lon": 0, "CEa": [NaN], "EL": [2], "CU": [0.9]}',
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"]
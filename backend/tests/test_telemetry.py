@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.telemetry_service import (
+    BINARY_RECORD,
+    Granularity,
+    Metric,
+    TelemetryBuffer,
+    get_rollups,
+    parse_binary,
+    parse_ndjson,
+)
+
+def ndjson(*items) -> bytes:
+    return b"\n".join(json.dumps(item).encode() for item in items)
+
+@pytest.mark.parametrize("value", ("NaN", "Infinity", "-Infinity"))
+def test_ndjson_rejects_non_finite_values(value):
+    body = ndjson(
+        {"sensor_id": "s1", "metric": "flow", "ts": "2026-10-19T10:00:00Z", "value": 1.5},
+        {"sensor_id": "s1", "metric": "flow", "ts": "2026-10-19T10:01:00Z", "value": value},
+    )
+    with pytest.raises(ValueError, match="line 2"):
+        parse_ndjson(body)
+
+def test_ndjson_converts_timestamps_to_utc():
+    body = ndjson(
+        {"sensor_id": 7, "metric": "moisture", "ts": "2026-10-19T12:30:00+02:00", "value": 3},
+        {"sensor_id": 7, "metric": "moisture", "ts": 1792405800, "value": 4},
+    )
+    assert parse_ndjson(body) == [
+        ("7", "moisture", datetime(2026, 10, 19, 10, 30), 3.0),
+        ("7", "moisture", datetime(2026, 10, 19, 10, 30), 4.0),
+    ]
+
+def test_binary_rejects_non_finite_values():
+    records = np.zeros(2, dtype=BINARY_RECORD)
+    records["ts"] = 1792405800
+    records["value"] = (1.0, np.nan)
+    with pytest.raises(ValueError, match="finite"):
+        parse_binary(records.tobytes())
+
+def test_binary_rejects_partial_records():
+    with pytest.raises(ValueError):
+        parse_binary(np.zeros(1, dtype=BINARY_RECORD).tobytes()[:-1])
+
+def test_rollups_aggregate_readings(db, make_user):
+    user_id = make_user().id
+    buffer = TelemetryBuffer()
+    readings = [
+        ("s1", "flow", datetime(2026, 10, 19, 10, 0), 1.0),
+        ("s1", "flow", datetime(2026, 10, 19, 10, 30), 3.0),
+        ("s1", "flow", datetime(2026, 10, 19, 11, 0), 2.0),
+    ]
+    # Rollups already written are updated by later flushes.
+    buffer.add(user_id, readings[:1])
+    buffer.flush()
+    buffer.add(user_id, readings[1:])
+    buffer.flush()
+
+    hours = get_rollups(db, user_id, "s1", Metric.FLOW, Granularity.HOUR)
+    assert [(r.bucket.hour, r.count, r.total, r.minimum, r.maximum, r.last_value) for r in hours] == [
+        (10, 2, 4.0, 1.0, 3.0, 3.0),
+        (11, 1, 2.0, 2.0, 2.0, 2.0),
+    ]
+    [day] = get_rollups(db, user_id, "s1", Metric.FLOW, Granularity.DAY)
+    assert (day.count, day.total, day.minimum, day.maximum) == (3, 6.0, 1.0, 3.0)
+
+def test_flush_drops_invalid_readings_only(db, make_user):
+    user_id = make_user().id
+    buffer = TelemetryBuffer()
+    buffer.add(user_id, [
+        ("s1", "flow", datetime(2026, 10, 19, 10, 0), 1.0),
+        ("s1", "flow", datetime(2026, 10, 19, 10, 5), None),
+        ("s1", "flow", datetime(2026, 10, 19, 10, 10), 2.0),
+    ])
+    buffer.flush()
+
+    # The invalid reading is not requeued to fail every later flush.
+    assert buffer.pending == 0
+    [hour] = get_rollups(db, user_id, "s1", Metric.FLOW, Granularity.HOUR)
+    assert (hour.count, hour.total) == (2, 3.0)
+
+def test_ingest_rejects_nan(client, make_user):
+    client.user = make_user()
+    response = client.post(
+        "/api/v1/telemetry/readings",
+        content=b'{"sensor_id": "s1", "metric": "flow", "ts": 0, "value": NaN}',
+    )
+    assert response.status_code == 400
@@ -131,6 +131,12 @@ class ApiService {
     return this.request(`/climate/?lat=${lat}&lon=${lon}`);
   }
 
+  // Dashboard endpoint: climate and every crop's metrics in one call
+  async getDashboard(data) {
+    const params = new URLSearchParams(data);
+    return this.request(`/dashboard/?${params}`);
+  }
+
   // Irrigation calculation endpoints
   async calculateNRn(data) {
     const params = new URLSearchParams(data);
@@ -911,9 +917,9 @@ const CalculatorPage = () => {
             CU: formData.CU
           });
           break;
-        case 'NRt':
-          result = await api.calculateNRt({
-            crop_name: formData.crop_name,
+        case 'NRt': {
+          // One round trip computes the climate and the metrics of every crop.
+          const dashboard = await api.getDashboard({
             lat: formData.lat,
             lon: formData.lon,
             CU: formData.CU,
@@ -921,7 +927,12 @@ const CalculatorPage = () => {
             EL: formData.EL,
             CEa: formData.CEa
           });
+          result = dashboard.crops.find(crop => crop.name === formData.crop_name);
+          if (!result) {
+            throw new Error(`Crop '${formData.crop_name}' not found`);
+          }
           break;
+        }
         case 'Dn':
           result = await api.calculateDn({
             crop_name: formData.crop_name,